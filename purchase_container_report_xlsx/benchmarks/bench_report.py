@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""End-to-end profile of the container report on synthetic data.
+
+For each scale, generates that many sale orders (with origin-linked POs,
+containers, product summary lines and customer invoices) and reports, per
+stage, the SQL query count, wall time, peak RSS and output size. Run it
+from an Odoo shell; everything is rolled back at the end::
+
+    BENCH_SCALES=1000,10000,100000 BENCH_FORMATS=xlsx,csv BENCH_OUTPUT=bench.json \\
+        odoo shell -d <db> < purchase_container_report_xlsx/benchmarks/bench_report.py
+
+or import it and call ``run(env, (1000, 10000))``. With ``BENCH_OUTPUT`` the
+results are also written as JSON, to compare runs before and after a change.
+
+The generated data is never committed, so forked shard workers could not
+see it: the dataset is built serially here (see ``bench_sharding.py`` for
+the worker scaling on committed data).
+"""
+import json
+import os
+import resource
+import tempfile
+import time
+from datetime import date, timedelta
+
+from odoo import fields
+from odoo.addons.purchase_container_report_xlsx.tests.common import (
+    generate_container_report_data,
+)
+
+# One synthetic year per scale, so scales never share a date range.
+FIRST_YEAR = 2100
+
+
+def _peak_rss_mb():
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+class Profiler:
+    def __init__(self, env):
+        self.env = env
+        self.results = []
+
+    def stage(self, scale, name, func):
+        """Run ``func`` and record its metrics; ``func`` may return the size
+        in bytes of what it produced."""
+        cr = self.env.cr
+        queries = cr.sql_log_count
+        start = time.perf_counter()
+        size = func()
+        self.env.flush_all()
+        self.results.append({
+            "scale": scale,
+            "stage": name,
+            "queries": cr.sql_log_count - queries,
+            "seconds": round(time.perf_counter() - start, 3),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "size": size if isinstance(size, int) else None,
+        })
+        print("%8d %-18s %8d %10.3f %10.1f %12s" % (
+            scale, name, self.results[-1]["queries"], self.results[-1]["seconds"],
+            self.results[-1]["peak_rss_mb"], size if isinstance(size, int) else ""))
+
+
+def _write(wizard):
+    with tempfile.TemporaryFile() as report:
+        wizard._write_report(report, constant_memory=True)
+        return report.tell()
+
+
+def run(env, scales=(1000, 10000), formats=("xlsx", "csv"), output=None):
+    profiler = Profiler(env)
+    env["ir.config_parameter"].sudo().set_param(
+        "purchase_container_report_xlsx.report_workers", 1)
+    print("%8s %-18s %8s %10s %10s %12s" % (
+        "scale", "stage", "queries", "seconds", "rss_mb", "bytes"))
+    for n, scale in enumerate(scales):
+        date_from = date(FIRST_YEAR + n, 1, 1)
+        date_to = date(FIRST_YEAR + n, 12, 30)
+        profiler.stage(scale, "generate", lambda: generate_container_report_data(
+            env, scale, date_from, date_to, prefix="BENCH%d" % n))
+        wizard = env["purchase.container.report.wizard"].create({
+            "date_from": date_from,
+            "date_to": date_to + timedelta(days=1),
+        })
+        Line = env["purchase.container.report.line"]
+        dt_from = fields.Datetime.to_datetime(wizard.date_from)
+        dt_to = fields.Datetime.to_datetime(wizard.date_to)
+        env.invalidate_all()
+        profiler.stage(scale, "dataset refresh", lambda: Line._refresh_range(dt_from, dt_to))
+        env.invalidate_all()
+        profiler.stage(scale, "dataset read", lambda: len(Line._read_range(dt_from, dt_to)))
+        today = date.today()
+        profiler.stage(scale, "rows", lambda: sum(
+            1 for _row in wizard._iter_report_rows(Line._read_range(dt_from, dt_to), today)))
+        for output_format in formats:
+            wizard.output_format = output_format
+            env.invalidate_all()
+            profiler.stage(scale, "write %s" % output_format, lambda: _write(wizard))
+            env.invalidate_all()
+            profiler.stage(scale, "cache miss %s" % output_format, lambda: (
+                wizard._get_report_cache(constant_memory=True).file_size))
+            profiler.stage(scale, "cache hit %s" % output_format, lambda: (
+                wizard._get_report_cache(constant_memory=True).file_size))
+    if output:
+        with open(output, "w") as f:
+            json.dump(profiler.results, f, indent=2)
+    return profiler.results
+
+
+if "env" in globals():
+    run(
+        env,  # noqa: F821 - provided by odoo shell
+        [int(s) for s in os.environ.get("BENCH_SCALES", "1000,10000").split(",")],
+        os.environ.get("BENCH_FORMATS", "xlsx,csv").split(","),
+        os.environ.get("BENCH_OUTPUT"),
+    )
+    env.cr.rollback()  # noqa: F821
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Scaling benchmark for the sharded container report dataset builder.
+
+Run it from an Odoo shell on a database holding representative, committed
+data (forked shard workers cannot see uncommitted rows)::
+
+    BENCH_DATE_FROM=2025-01-01 BENCH_DATE_TO=2025-12-31 BENCH_WORKERS=1,2,4,8 \\
+        odoo shell -d <db> < purchase_container_report_xlsx/benchmarks/bench_sharding.py
+
+or import it and call ``run(env, date_from, date_to, (1, 2, 4))``.
+"""
+import os
+import time
+
+
+def run(env, date_from, date_to, worker_counts=(1, 2, 4, 8)):
+    wizard = env["purchase.container.report.wizard"].create({
+        "date_from": date_from,
+        "date_to": date_to,
+    })
+    sale_orders = wizard._get_report_sale_orders()
+    print("%d sale orders between %s and %s" % (len(sale_orders), date_from, date_to))
+    print("%8s %10s %10s %8s" % ("workers", "rows", "seconds", "speedup"))
+    baseline = None
+    for workers in worker_counts:
+        env.invalidate_all()
+        start = time.perf_counter()
+        count = len(wizard._build_dataset_values(sale_orders, workers))
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print("%8d %10d %10.2f %7.2fx" % (workers, count, elapsed, baseline / elapsed))
+    return wizard
+
+
+if "env" in globals():
+    run(
+        env,  # noqa: F821 - provided by odoo shell
+        os.environ.get("BENCH_DATE_FROM", "2025-01-01"),
+        os.environ.get("BENCH_DATE_TO", "2025-12-31"),
+        [int(w) for w in os.environ.get("BENCH_WORKERS", "1,2,4,8").split(",")],
+    )
+    env.cr.rollback()  # noqa: F821
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Per-row cost of the container report XLSX writer, before and after the
+report-scoped lookup tables and run-based ``write_row`` output.
+
+Only needs xlsxwriter, no database::
+
+    python purchase_container_report_xlsx/benchmarks/bench_xlsx_rows.py [rows]
+
+"before" replays the former inner loop: the state selection mapping is
+rebuilt and the date converted for every row, and each of the 17 cells is
+written with its own call. "after" writes precomputed tuples in format runs.
+"""
+import datetime
+import io
+import sys
+import time
+
+import xlsxwriter
+
+STATE_SELECTION = [
+    ("draft", "Draft"), ("transit", "In Transit"), ("arrived", "Arrived"), ("done", "Done"),
+]
+NUMBER_COLUMNS = (9, 14)
+
+
+def _formats(wb):
+    text_fmt = wb.add_format({"border": 1, "valign": "vcenter"})
+    num_fmt = wb.add_format({"border": 1, "valign": "vcenter", "num_format": "#,##0.00"})
+    date_fmt = wb.add_format({"border": 1, "valign": "vcenter", "num_format": "yyyy-mm-dd"})
+    return text_fmt, num_fmt, date_fmt
+
+
+def _source_rows(count):
+    for i in range(count):
+        yield {
+            "state": STATE_SELECTION[i % len(STATE_SELECTION)][0],
+            "so": "S%05d" % (i // 20),
+            "po": "P%05d" % (i // 20),
+            "container": "CONT%04d" % (i // 5),
+            "vendor": "Vendor %d" % (i % 50),
+            "material": "[MAT%03d] Material %d" % (i % 300, i % 300),
+            "qty": float(i % 97),
+            "uom": "m²",
+            "first": i % 5 == 0,
+        }
+
+
+def before(count):
+    output = io.BytesIO()
+    wb = xlsxwriter.Workbook(output, {"constant_memory": True})
+    ws = wb.add_worksheet("Report")
+    text_fmt, num_fmt, date_fmt = _formats(wb)
+    today = "2025-01-31"
+    for row, src in enumerate(_source_rows(count), start=1):
+        state = dict(STATE_SELECTION).get(src["state"], src["state"])
+        ws.write_datetime(row, 0, datetime.date.fromisoformat(today), date_fmt)
+        values = ["", "", src["so"], src["po"], state, src["container"], 12345,
+                  src["vendor"], src["material"]]
+        for col, value in enumerate(values[1:], start=1):
+            ws.write(row, col, value, text_fmt)
+        ws.write_number(row, 9, src["qty"], num_fmt)
+        ws.write(row, 10, src["uom"], text_fmt)
+        ws.write(row, 11, "", text_fmt)
+        ws.write(row, 12, "", text_fmt)
+        ws.write(row, 13, "INV/0001" if src["first"] else "", text_fmt)
+        if src["first"]:
+            ws.write_number(row, 14, 100.0, num_fmt)
+        else:
+            ws.write(row, 14, "", text_fmt)
+        ws.write(row, 15, "", text_fmt)
+        ws.write(row, 16, "", text_fmt)
+    wb.close()
+    return output.tell()
+
+
+def after(count):
+    output = io.BytesIO()
+    wb = xlsxwriter.Workbook(output, {"constant_memory": True})
+    ws = wb.add_worksheet("Report")
+    text_fmt, num_fmt, date_fmt = _formats(wb)
+    today = datetime.date.fromisoformat("2025-01-31")
+    labels = dict(STATE_SELECTION)
+    column_formats = [date_fmt] + [
+        num_fmt if col in NUMBER_COLUMNS else text_fmt for col in range(1, 17)]
+    runs = []
+    for col, fmt in enumerate(column_formats):
+        if runs and runs[-1][2] is fmt:
+            runs[-1][1] = col + 1
+        else:
+            runs.append([col, col + 1, fmt])
+    for row, src in enumerate(_source_rows(count), start=1):
+        values = (
+            today, "", src["so"], src["po"], labels.get(src["state"], src["state"]),
+            src["container"], 12345, src["vendor"], src["material"], src["qty"], src["uom"],
+            "", "", "INV/0001" if src["first"] else "", 100.0 if src["first"] else "", "", "",
+        )
+        for first, last, fmt in runs:
+            ws.write_row(row, first, values[first:last], fmt)
+    wb.close()
+    return output.tell()
+
+
+def main(count):
+    print("%d rows" % count)
+    for name, writer in (("before", before), ("after", after)):
+        start = time.perf_counter()
+        size = writer(count)
+        elapsed = time.perf_counter() - start
+        print("%-7s %8.2f s %8.2f us/row %10d bytes" % (
+            name, elapsed, elapsed / count * 1e6, size))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from odoo import http
+from odoo.http import request
+
+
+class PurchaseContainerReportController(http.Controller):
+
+    @http.route(
+        "/purchase_container_report_xlsx/download/<int:wizard_id>",
+        type="http", auth="user",
+    )
+    def download_report(self, wizard_id, **kwargs):
+        """Stream the container report of ``wizard_id`` as a download.
+
+        On a cache miss the file is written row by row (xlsxwriter's
+        ``constant_memory`` mode for XLSX) to a temporary file, then stored
+        as the report cache attachment; the attachment is sent from the
+        filestore in chunks, without a base64 copy.
+        """
+        wizard = request.env["purchase.container.report.wizard"].browse(wizard_id).exists()
+        if not wizard:
+            raise request.not_found()
+        wizard.check_access_rights("read")
+        wizard.check_access_rule("read")
+
+        entry = wizard._get_report_cache(constant_memory=True)
+        stream = request.env["ir.binary"]._get_stream_from(entry.attachment_id)
+        return stream.get_response(as_attachment=True)
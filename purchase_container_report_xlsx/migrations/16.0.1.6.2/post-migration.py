@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+from odoo import SUPERUSER_ID, api
+
+
+def migrate(cr, version):
+    """Run the pre-generation cron hourly, each schedule now being generated
+    at night in its user's timezone. The cron record is ``noupdate``."""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    cron = env.ref(
+        "purchase_container_report_xlsx.ir_cron_purchase_container_report_schedule",
+        raise_if_not_found=False)
+    if cron:
+        cron.write({"interval_number": 1, "interval_type": "hours"})
@@ -0,0 +1,15 @@
+from . import account_move
+from . import product_product
+from . import product_template
+from . import purchase_container
+from . import purchase_container_report_cache
+from . import purchase_container_report_job
+from . import purchase_container_report_line
+from . import purchase_container_report_schedule
+from . import purchase_container_report_stat
+from . import purchase_order
+from . import res_partner
+from . import sale_order
+from . import stock_move
+from . import stock_picking
+from . import uom_uom
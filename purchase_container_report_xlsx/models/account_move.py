@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models
+from odoo.tools import create_index
+
+# Invoice fields the container report dataset depends on.
+CONTAINER_REPORT_FIELDS = {
+    "name", "state", "move_type", "invoice_origin", "invoice_line_ids", "line_ids",
+}
+
+
+class AccountMove(models.Model):
+    _inherit = "account.move"
+
+    def init(self):
+        super().init()
+        # Serves the container report's substring match of SO names in
+        # invoice origins (ILIKE '%name%'), which a btree index cannot.
+        if self.pool.has_trigram:
+            create_index(
+                self.env.cr, "account_move_invoice_origin_trgm_index", self._table,
+                ["invoice_origin gin_trgm_ops"], method="gin")
+
+    def _get_container_report_invoices(self):
+        return self.sudo().filtered(lambda m: m.move_type == "out_invoice")
+
+    def _get_container_report_orders(self, origins=()):
+        """Sale orders whose container report rows list these invoices, or
+        whose name appears in one of the extra ``origins``."""
+        invoices = self._get_container_report_invoices()
+        origins = set(origins).union(invoices.mapped("invoice_origin"))
+        return invoices.invoice_line_ids.sale_line_ids.order_id | (
+            self.env["sale.order"]._get_container_report_orders_by_origin(origins))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        moves = super().create(vals_list)
+        moves._get_container_report_orders()._mark_container_report_dirty()
+        return moves
+
+    def write(self, vals):
+        if not CONTAINER_REPORT_FIELDS.intersection(vals):
+            return super().write(vals)
+        # Origins before and after the write are resolved in a single lookup.
+        invoices = self._get_container_report_invoices()
+        origins = invoices.mapped("invoice_origin")
+        sale_orders = invoices.invoice_line_ids.sale_line_ids.order_id
+        res = super().write(vals)
+        (sale_orders | self._get_container_report_orders(origins))._mark_container_report_dirty()
+        return res
+
+    def unlink(self):
+        sale_orders = self._get_container_report_orders()
+        res = super().unlink()
+        sale_orders._mark_container_report_dirty()
+        return res
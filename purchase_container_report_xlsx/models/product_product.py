@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+
+# Variant fields shown in the container report material column.
+CONTAINER_REPORT_FIELDS = {"default_code", "product_template_attribute_value_ids"}
+
+
+class ProductProduct(models.Model):
+    _inherit = "product.product"
+
+    def _get_container_report_orders(self):
+        """Sale orders whose container report rows show these products."""
+        return self.env["purchase.container"].sudo().search(
+            [("product_summary_line_ids.product_id", "in", self.ids)]
+        )._get_container_report_orders()
+
+    def write(self, vals):
+        res = super().write(vals)
+        if CONTAINER_REPORT_FIELDS.intersection(vals):
+            self._get_container_report_orders()._mark_container_report_dirty()
+        return res
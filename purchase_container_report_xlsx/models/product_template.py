@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+
+# Template fields shown in the container report material column.
+CONTAINER_REPORT_FIELDS = {"name"}
+
+
+class ProductTemplate(models.Model):
+    _inherit = "product.template"
+
+    def write(self, vals):
+        res = super().write(vals)
+        if CONTAINER_REPORT_FIELDS.intersection(vals):
+            variants = self.sudo().with_context(active_test=False).product_variant_ids
+            variants._get_container_report_orders()._mark_container_report_dirty()
+        return res
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+
+from .sale_order import patch_container_report_hooks
+
+
+class PurchaseContainer(models.Model):
+    _inherit = "purchase.container"
+
+    def _register_hook(self):
+        super()._register_hook()
+        # The summary line model is only known through the container field.
+        lines_field = self._fields["product_summary_line_ids"]
+        container_field = lines_field.inverse_name
+        patch_container_report_hooks(
+            self.env.registry[lines_field.comodel_name],
+            lambda lines: lines.sudo()[container_field]._get_container_report_orders(),
+        )
+
+    def _get_container_report_purchases(self):
+        """Purchase orders showing these containers in the container report."""
+        purchases = self.env["purchase.order"].sudo().search(
+            [("container_ids", "in", self.ids)])
+        pickings = self.env["stock.picking"].sudo().search(
+            [("container_id", "in", self.ids)])
+        return purchases | pickings.purchase_id
+
+    def _get_container_report_orders(self):
+        """Sale orders whose container report rows show these containers."""
+        return self._get_container_report_purchases()._get_container_report_orders()
+
+    def write(self, vals):
+        res = super().write(vals)
+        self._get_container_report_orders()._mark_container_report_dirty()
+        return res
+
+    def unlink(self):
+        sale_orders = self._get_container_report_orders()
+        res = super().unlink()
+        sale_orders._mark_container_report_dirty()
+        return res
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+import os
+
+from odoo import api, fields, models
+from odoo.tools import create_index
+
+
+class PurchaseContainerReportCache(models.Model):
+    """Generated report files, reused while the data they show is unchanged.
+
+    An entry is keyed by the report parameters (range, company, format and
+    the date printed in the report) plus the data version of the range, see
+    :meth:`purchase.container.report.line._get_range_fingerprint`. Entries
+    are evicted least recently used first once the configured count or total
+    size is exceeded.
+    """
+    _name = "purchase.container.report.cache"
+    _description = "Purchase Container Report Cache Entry"
+    _order = "last_used desc, id desc"
+
+    date_from = fields.Date(required=True, readonly=True)
+    date_to = fields.Date(required=True, readonly=True)
+    company_id = fields.Many2one("res.company", required=True, readonly=True)
+    output_format = fields.Char(required=True, readonly=True)
+    include_summary = fields.Boolean(readonly=True)
+    split_by = fields.Char(readonly=True)
+    split_output = fields.Char(readonly=True)
+    report_date = fields.Date(required=True, readonly=True)
+    fingerprint = fields.Char(required=True, readonly=True)
+    attachment_id = fields.Many2one("ir.attachment", string="File", readonly=True)
+    file_size = fields.Integer(readonly=True)
+    last_used = fields.Datetime(
+        required=True, readonly=True, index=True, default=fields.Datetime.now)
+    hit_count = fields.Integer(readonly=True)
+
+    def init(self):
+        create_index(
+            self.env.cr, "purchase_container_report_cache_key_index", self._table,
+            ["date_from", "date_to", "company_id", "output_format", "report_date"])
+
+    def _get_key_domain(self, wizard, report_date):
+        return [
+            ("date_from", "=", wizard.date_from),
+            ("date_to", "=", wizard.date_to),
+            ("company_id", "=", wizard.env.company.id),
+            ("output_format", "=", wizard.output_format),
+            ("include_summary", "=", wizard.include_summary),
+            ("split_by", "=", wizard.split_by),
+            ("split_output", "=", wizard.split_output),
+            ("report_date", "=", report_date),
+        ]
+
+    @api.model
+    def _lookup(self, wizard, report_date, fingerprint):
+        """Return the entry matching the wizard parameters and ``fingerprint``
+        (marking it as used), or an empty recordset."""
+        entry = self.search(
+            self._get_key_domain(wizard, report_date) + [("fingerprint", "=", fingerprint)],
+            limit=1)
+        if entry:
+            entry.write({
+                "last_used": fields.Datetime.now(),
+                "hit_count": entry.hit_count + 1,
+            })
+        return entry
+
+    @api.model
+    def _store(self, wizard, report_date, fingerprint, report):
+        """Cache the file object ``report`` as the report file of the wizard
+        parameters.
+
+        Outdated entries of the same parameters are dropped, then the cache
+        is trimmed to its configured limits.
+        """
+        self.search(self._get_key_domain(wizard, report_date)).unlink()
+        report.seek(0, os.SEEK_END)
+        entry = self.create({
+            "date_from": wizard.date_from,
+            "date_to": wizard.date_to,
+            "company_id": wizard.env.company.id,
+            "output_format": wizard.output_format,
+            "include_summary": wizard.include_summary,
+            "split_by": wizard.split_by,
+            "split_output": wizard.split_output,
+            "report_date": report_date,
+            "fingerprint": fingerprint,
+            "file_size": report.tell(),
+        })
+        report.seek(0)
+        entry.attachment_id = self.env["ir.attachment"].sudo().create({
+            "name": wizard._get_report_filename(),
+            "mimetype": wizard._get_report_mimetype(),
+            "res_model": self._name,
+            "res_id": entry.id,
+            "raw": report.read(),
+        })
+        self._evict(keep=entry)
+        return entry
+
+    def _get_limits(self):
+        """Return the maximum number of entries and total size in bytes."""
+        ICP = self.env["ir.config_parameter"].sudo()
+        max_entries = int(ICP.get_param(
+            "purchase_container_report_xlsx.cache_max_entries", 50))
+        max_size = int(ICP.get_param(
+            "purchase_container_report_xlsx.cache_max_size_mb", 512)) * 1024 * 1024
+        return max_entries, max_size
+
+    @api.model
+    def _evict(self, keep=None):
+        """Drop entries printed on a past date, then the least recently used
+        ones until both limits are met. ``keep`` is never evicted."""
+        keep = keep or self.browse()
+        today = fields.Date.context_today(self)
+        (self.search([("report_date", "<", today)]) - keep).unlink()
+
+        max_entries, max_size = self._get_limits()
+        entries = self.search_read([], ["file_size"], order="last_used desc, id desc")
+        count, size, evict_ids = 0, 0, []
+        for entry in entries:
+            count += 1
+            size += entry["file_size"]
+            if entry["id"] not in keep.ids and (count > max_entries or size > max_size):
+                evict_ids.append(entry["id"])
+                count -= 1
+                size -= entry["file_size"]
+        self.browse(evict_ids).unlink()
+
+    def unlink(self):
+        attachments = self.attachment_id
+        res = super().unlink()
+        attachments.unlink()
+        return res
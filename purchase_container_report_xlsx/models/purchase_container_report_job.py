@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+import logging
+from datetime import timedelta
+
+from odoo import fields, models, _
+
+_logger = logging.getLogger(__name__)
+
+
+class PurchaseContainerReportJob(models.Model):
+    _name = "purchase.container.report.job"
+    _description = "Purchase Container Report Background Job"
+    _order = "create_date desc, id desc"
+
+    name = fields.Char(required=True, readonly=True)
+    date_from = fields.Date(string="Date From", required=True, readonly=True)
+    date_to = fields.Date(string="Date To", required=True, readonly=True)
+    output_format = fields.Selection([
+        ("xlsx", "Excel (XLSX)"),
+        ("csv", "CSV"),
+        ("parquet", "Parquet"),
+    ], string="Format", default="xlsx", required=True, readonly=True)
+    include_summary = fields.Boolean(string="Summary Sheet", readonly=True)
+    split_by = fields.Selection([
+        ("none", "Row Budget Only"),
+        ("month", "Month"),
+        ("vendor", "Vendor"),
+    ], string="Split By", default="none", required=True, readonly=True)
+    split_output = fields.Selection([
+        ("sheet", "Worksheets"),
+        ("zip", "Zipped Files"),
+    ], string="Split Into", default="sheet", required=True, readonly=True)
+    user_id = fields.Many2one(
+        "res.users", string="Requested By", required=True, readonly=True,
+        default=lambda self: self.env.user)
+    company_id = fields.Many2one(
+        "res.company", required=True, readonly=True,
+        default=lambda self: self.env.company)
+    state = fields.Selection([
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ], default="queued", required=True, readonly=True, index=True)
+    attachment_id = fields.Many2one("ir.attachment", string="File", readonly=True)
+    error = fields.Text(readonly=True)
+
+    def _trigger_runner(self):
+        self.env.ref(
+            "purchase_container_report_xlsx.ir_cron_purchase_container_report_job"
+        )._trigger()
+
+    def _get_job_timeout(self):
+        """Minutes after which a running job is considered interrupted."""
+        return int(self.env["ir.config_parameter"].sudo().get_param(
+            "purchase_container_report_xlsx.job_timeout", 120))
+
+    def _fail_interrupted_jobs(self):
+        """Fail the jobs still running after the timeout.
+
+        A job is flagged as running and committed before its report is
+        generated, so a worker killed meanwhile (time or memory limit,
+        restart) leaves it running forever.
+        """
+        limit = fields.Datetime.now() - timedelta(minutes=self._get_job_timeout())
+        for job in self.search([("state", "=", "running"), ("write_date", "<", limit)]):
+            _logger.warning("Container report job %s was interrupted", job.id)
+            job.write({
+                "state": "failed",
+                "error": _("The report generation was interrupted, please try again."),
+            })
+            job._notify_user()
+        self.env.cr.commit()
+
+    def _cron_run_jobs(self):
+        """Generate the queued reports, committing after each one."""
+        self._fail_interrupted_jobs()
+        for job in self.search([("state", "=", "queued")], order="id"):
+            job.state = "running"
+            self.env.cr.commit()
+            try:
+                job._run()
+            except Exception as e:
+                self.env.cr.rollback()
+                _logger.exception("Container report job %s failed", job.id)
+                job.write({"state": "failed", "error": str(e)})
+            job._notify_user()
+            self.env.cr.commit()
+
+    def _run(self):
+        self.ensure_one()
+        wizard = self.env["purchase.container.report.wizard"].with_user(
+            self.user_id).with_company(self.company_id).create({
+                "date_from": self.date_from,
+                "date_to": self.date_to,
+                "output_format": self.output_format,
+                "include_summary": self.include_summary,
+                "split_by": self.split_by,
+                "split_output": self.split_output,
+            })
+        entry = wizard._get_report_cache(constant_memory=True)
+        # Copying the stored file reference keeps a single filestore copy of
+        # the file and never loads its content.
+        attachment = entry.attachment_id.sudo().copy({
+            "name": wizard._get_report_filename(),
+            "res_model": self._name,
+            "res_id": self.id,
+        })
+        self.write({"state": "done", "attachment_id": attachment.id, "error": False})
+
+    def _notify_user(self):
+        self.ensure_one()
+        if self.state == "done":
+            message = _("Container report %s is ready to download.", self.name)
+            notification_type = "success"
+        else:
+            message = _("Container report %s could not be generated.", self.name)
+            notification_type = "danger"
+        self.env["bus.bus"]._sendone(self.user_id.partner_id, "simple_notification", {
+            "title": _("Container Excel Report"),
+            "message": message,
+            "type": notification_type,
+            "sticky": True,
+        })
+
+    def action_download(self):
+        self.ensure_one()
+        return {
+            "type": "ir.actions.act_url",
+            "url": "/web/content/%s?download=true" % self.attachment_id.id,
+            "target": "self",
+        }
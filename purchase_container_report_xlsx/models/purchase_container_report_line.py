@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+from odoo.tools import create_index
+
+# Dataset rows fetched per query when streaming a range.
+READ_BATCH_SIZE = 10000
+# Language of the names stored in the dataset, as the report headers.
+DATASET_LANG = "en_US"
+
+
+class PurchaseContainerReportLine(models.Model):
+    """Pre-joined SO / PO / container / summary line / invoice dataset.
+
+    One row per container product line of a sale order, kept up to date
+    incrementally: changes on the source documents only flag the affected
+    sale orders (``sale.order.container_report_dirty``), and their rows are
+    rebuilt the next time a report covering them is generated.
+
+    Rows are shared by all users, as are the report files cached from them,
+    so names are stored in :data:`DATASET_LANG` whoever triggers the refresh.
+    """
+    _name = "purchase.container.report.line"
+    _description = "Purchase Container Report Dataset Line"
+    _order = "date_order, sale_order_id, sequence"
+
+    sale_order_id = fields.Many2one(
+        "sale.order", required=True, readonly=True, index=True, ondelete="cascade")
+    date_order = fields.Datetime(required=True, readonly=True, index=True)
+    sequence = fields.Integer(readonly=True)
+    so_name = fields.Char(string="SO", readonly=True)
+    project = fields.Char(readonly=True)
+    po_names = fields.Char(string="PO", readonly=True)
+    vendor = fields.Char(readonly=True)
+    container_name = fields.Char(string="Container", readonly=True)
+    container_state = fields.Char(string="Status", readonly=True)
+    material = fields.Char(readonly=True)
+    qty = fields.Float(string="Quantity", readonly=True)
+    uom = fields.Char(string="Unit", readonly=True)
+    invoice_data = fields.Json(
+        readonly=True, help="[invoice id, invoice name] pairs of the sale order.")
+
+    def init(self):
+        create_index(
+            self.env.cr, "purchase_container_report_line_range_index", self._table,
+            ["date_order", "sale_order_id", "sequence"])
+        create_index(
+            self.env.cr, "purchase_container_report_line_vendor_index", self._table,
+            ["COALESCE(vendor, '')", "date_order", "sale_order_id", "sequence"])
+
+    @api.model
+    def _refresh_range(self, date_from, date_to):
+        """Rebuild the rows of the flagged sale orders inside the range.
+
+        Sale orders whose date moved out of the range still have stale rows
+        in it, so they are picked up through the existing rows too.
+        """
+        Wizard = self.env["purchase.container.report.wizard"]
+        with Wizard._report_stage("fetch SOs"):
+            self.env.cr.execute(
+                """
+                SELECT so.id
+                  FROM sale_order so
+                 WHERE so.container_report_dirty
+                   AND so.date_order >= %(from)s AND so.date_order <= %(to)s
+                 UNION
+                SELECT so.id
+                  FROM purchase_container_report_line line
+                  JOIN sale_order so ON so.id = line.sale_order_id
+                 WHERE so.container_report_dirty
+                   AND line.date_order >= %(from)s AND line.date_order <= %(to)s
+                """,
+                {"from": date_from, "to": date_to},
+            )
+            so_ids = [row[0] for row in self.env.cr.fetchall()]
+            if not so_ids:
+                return
+            sale_orders = self.env["sale.order"].sudo().search(
+                [("id", "in", so_ids)], order="date_order, id")
+        self._refresh(sale_orders)
+
+    @api.model
+    def _refresh(self, sale_orders):
+        """Replace the dataset rows of ``sale_orders``."""
+        if not sale_orders:
+            return
+        Wizard = self.env["purchase.container.report.wizard"].with_context(lang=DATASET_LANG)
+        values = Wizard._build_dataset_values(sale_orders.with_context(lang=DATASET_LANG))
+        with Wizard._report_stage("store dataset"):
+            self.flush_model()
+            self.env.cr.execute(
+                "DELETE FROM purchase_container_report_line WHERE sale_order_id IN %s",
+                [tuple(sale_orders.ids)],
+            )
+            self.invalidate_model()
+            self.sudo().create(values)
+            sale_orders._mark_container_report_clean()
+            self.flush_model()
+
+    @api.model
+    def _get_range_fingerprint(self, date_from, date_to):
+        """Return a version string of the range's data, refreshing it first.
+
+        Any change on the sale orders, POs, containers, pickings or invoices
+        of the range, or on the names it shows, rebuilds the affected rows,
+        which moves the latest write date of the range; rows leaving the
+        range change its row count.
+        """
+        self._refresh_range(date_from, date_to)
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            SELECT count(*), max(write_date)
+              FROM purchase_container_report_line
+             WHERE date_order >= %s AND date_order <= %s
+            """,
+            [date_from, date_to],
+        )
+        return "%s-%s" % self.env.cr.fetchone()
+
+    @api.model
+    def _read_range(self, date_from, date_to):
+        """Return the dataset rows of the range as dicts, in report order."""
+        return list(self._iter_range(date_from, date_to))
+
+    @api.model
+    def _iter_range(self, date_from, date_to, by_vendor=False, batch_size=READ_BATCH_SIZE):
+        """Yield the dataset rows of the range as dicts, in report order
+        (vendor first if ``by_vendor``).
+
+        Rows are fetched in keyset-paginated batches of ``batch_size``, so
+        at most one batch is held in memory at a time.
+        """
+        keys = ["date_order", "sale_order_id", "sequence"]
+        if by_vendor:
+            keys.insert(0, "COALESCE(vendor, '')")
+        Wizard = self.env["purchase.container.report.wizard"]
+        self.flush_model()
+        after = ""
+        params = {"from": date_from, "to": date_to, "limit": batch_size}
+        while True:
+            with Wizard._report_stage("read dataset"):
+                self.env.cr.execute(
+                    """
+                    SELECT sale_order_id, date_order, sequence, so_name, project,
+                           po_names, vendor, container_name, container_state,
+                           material, qty, uom, invoice_data
+                      FROM purchase_container_report_line
+                     WHERE date_order >= %%(from)s AND date_order <= %%(to)s %s
+                  ORDER BY %s
+                     LIMIT %%(limit)s
+                    """ % (after, ", ".join(keys)),
+                    params,
+                )
+                rows = self.env.cr.dictfetchall()
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            last = rows[-1]
+            after = "AND (%s) > %%(after)s" % ", ".join(keys)
+            params["after"] = tuple(
+                ([last["vendor"] or ""] if by_vendor else [])
+                + [last["date_order"], last["sale_order_id"], last["sequence"]]
+            )
+
+    @api.model
+    def _read_range_totals(self, date_from, date_to, groupby):
+        """Return the row count and quantity total of the range per
+        ``groupby`` fields, as one GROUP BY query."""
+        return self.read_group(
+            [("date_order", ">=", date_from), ("date_order", "<=", date_to)],
+            ["qty:sum"], groupby, orderby=", ".join(groupby), lazy=False)
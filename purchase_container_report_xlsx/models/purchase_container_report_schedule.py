@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import logging
+
+from dateutil.relativedelta import relativedelta
+
+from odoo import fields, models
+
+_logger = logging.getLogger(__name__)
+
+# Local hour of the schedule user from which the windows are pre-generated.
+PREGENERATE_HOUR = 2
+
+
+class PurchaseContainerReportSchedule(models.Model):
+    """Date window of the container report generated ahead of time.
+
+    The pre-generation cron fills the report cache overnight, so the morning
+    download of the same window is a cache hit. The cron runs hourly and
+    generates each schedule once a day, from :data:`PREGENERATE_HOUR` in the
+    timezone of its user: the date printed in the report, which keys the
+    cache, is that user's date.
+    """
+    _name = "purchase.container.report.schedule"
+    _description = "Purchase Container Report Schedule"
+    _order = "sequence, id"
+
+    name = fields.Char(required=True)
+    active = fields.Boolean(default=True)
+    sequence = fields.Integer(default=10)
+    window = fields.Selection([
+        ("current_month", "Current Month"),
+        ("previous_month", "Previous Month"),
+        ("last_days", "Last Days"),
+    ], required=True, default="current_month")
+    days = fields.Integer(
+        default=30, help="Number of days of the window, today included (Last Days only).")
+    frequency = fields.Selection([
+        ("daily", "Every Day"),
+        ("monthly", "First Day of the Month"),
+    ], required=True, default="daily")
+    output_format = fields.Selection([
+        ("xlsx", "Excel (XLSX)"),
+        ("csv", "CSV"),
+        ("parquet", "Parquet"),
+    ], string="Format", default="xlsx", required=True)
+    include_summary = fields.Boolean(string="Summary Sheet")
+    split_by = fields.Selection([
+        ("none", "Row Budget Only"),
+        ("month", "Month"),
+        ("vendor", "Vendor"),
+    ], string="Split By", default="none", required=True)
+    split_output = fields.Selection([
+        ("sheet", "Worksheets"),
+        ("zip", "Zipped Files"),
+    ], string="Split Into", default="sheet", required=True)
+    company_id = fields.Many2one(
+        "res.company", required=True, default=lambda self: self.env.company)
+    user_id = fields.Many2one(
+        "res.users", string="Run As", required=True, default=lambda self: self.env.user)
+    last_run = fields.Datetime(readonly=True)
+    last_error = fields.Text(readonly=True)
+
+    def _get_window(self, today):
+        """Return the ``(date_from, date_to)`` window of the schedule on ``today``."""
+        self.ensure_one()
+        if self.window == "previous_month":
+            date_from = today + relativedelta(months=-1, day=1)
+            return date_from, date_from + relativedelta(day=31)
+        if self.window == "last_days":
+            return today - relativedelta(days=max(self.days, 1) - 1), today
+        return today + relativedelta(day=1), today + relativedelta(day=31)
+
+    def _is_due(self, today):
+        self.ensure_one()
+        return self.frequency == "daily" or today.day == 1
+
+    def _get_user_now(self):
+        """Return the current time in the timezone of the schedule user."""
+        self.ensure_one()
+        return fields.Datetime.context_timestamp(
+            self.with_user(self.user_id), fields.Datetime.now())
+
+    def _is_pending(self):
+        """Whether the schedule is due and not yet generated today, local
+        time of its user being past :data:`PREGENERATE_HOUR`."""
+        self.ensure_one()
+        now = self._get_user_now()
+        if now.hour < PREGENERATE_HOUR or not self._is_due(now.date()):
+            return False
+        if not self.last_run:
+            return True
+        last_run = fields.Datetime.context_timestamp(
+            self.with_user(self.user_id), self.last_run)
+        return last_run.date() < now.date()
+
+    def _get_wizard(self):
+        self.ensure_one()
+        date_from, date_to = self._get_window(
+            fields.Date.context_today(self.with_user(self.user_id)))
+        return self.env["purchase.container.report.wizard"].with_user(
+            self.user_id).with_company(self.company_id).create({
+                "date_from": date_from,
+                "date_to": date_to,
+                "output_format": self.output_format,
+                "include_summary": self.include_summary,
+                "split_by": self.split_by,
+                "split_output": self.split_output,
+            })
+
+    def _cron_pregenerate(self):
+        """Generate the due windows into the report cache, committing after
+        each one."""
+        for schedule in self.search([]):
+            if not schedule._is_pending():
+                continue
+            try:
+                schedule._get_wizard()._get_report_cache(constant_memory=True)
+            except Exception as e:
+                self.env.cr.rollback()
+                _logger.exception("Container report schedule %s failed", schedule.id)
+                schedule.write({"last_run": fields.Datetime.now(), "last_error": str(e)})
+            else:
+                schedule.write({"last_run": fields.Datetime.now(), "last_error": False})
+            self.env.cr.commit()
+
+    def action_download(self):
+        """Download the schedule's current window, straight from the cache
+        when it has been pre-generated."""
+        self.ensure_one()
+        entry = self._get_wizard()._get_report_cache()
+        return {
+            "type": "ir.actions.act_url",
+            "url": "/web/content/%s?download=true" % entry.attachment_id.id,
+            "target": "self",
+        }
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import logging
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+
+class PurchaseContainerReportStat(models.Model):
+    """Cost of one stage of one container report run.
+
+    Rows are written by
+    :meth:`purchase.container.report.wizard._get_report_cache` and kept for
+    ``purchase_container_report_xlsx.stats_retention_days`` days.
+    """
+    _name = "purchase.container.report.stat"
+    _description = "Purchase Container Report Stage Statistics"
+    _order = "id desc"
+
+    run_ref = fields.Char(string="Run", required=True, readonly=True, index=True)
+    stage = fields.Char(required=True, readonly=True)
+    date_from = fields.Date(readonly=True)
+    date_to = fields.Date(readonly=True)
+    output_format = fields.Char(string="Format", readonly=True)
+    user_id = fields.Many2one("res.users", readonly=True)
+    company_id = fields.Many2one("res.company", readonly=True)
+    cache_hit = fields.Boolean(readonly=True)
+    query_count = fields.Integer(string="Queries", readonly=True, group_operator="sum")
+    sql_time = fields.Float(
+        string="SQL Time (s)", digits=(16, 3), readonly=True, group_operator="sum")
+    python_time = fields.Float(
+        string="Python Time (s)", digits=(16, 3), readonly=True, group_operator="sum")
+
+    @api.model
+    def _record(self, wizard, run_ref, stages, cache_hit):
+        """Log ``stages`` and store them, merging repeated stage names.
+
+        ``stages`` is the list of ``{"stage", "query_count", "sql_time",
+        "python_time"}`` dicts collected by the wizard's ``_report_stage``.
+        """
+        totals = {}
+        for stage in stages:
+            total = totals.setdefault(stage["stage"], dict.fromkeys(
+                ("query_count", "sql_time", "python_time"), 0))
+            for key in total:
+                total[key] += stage[key]
+        _logger.info(
+            "Container report %s..%s (%s, %s): %s",
+            wizard.date_from, wizard.date_to, wizard.output_format,
+            "cache hit" if cache_hit else "generated",
+            ", ".join(
+                "%s %d queries / %.3fs SQL / %.3fs Python" % (
+                    name, t["query_count"], t["sql_time"], t["python_time"])
+                for name, t in totals.items()
+            ),
+        )
+        return self.sudo().create([dict(
+            total,
+            run_ref=run_ref,
+            stage=name,
+            date_from=wizard.date_from,
+            date_to=wizard.date_to,
+            output_format=wizard.output_format,
+            user_id=self.env.uid,
+            company_id=self.env.company.id,
+            cache_hit=cache_hit,
+        ) for name, total in totals.items()])
+
+    @api.autovacuum
+    def _gc_stats(self):
+        days = int(self.env["ir.config_parameter"].sudo().get_param(
+            "purchase_container_report_xlsx.stats_retention_days", 90))
+        self.sudo().search([
+            ("create_date", "<", fields.Datetime.now() - timedelta(days=days)),
+        ]).unlink()
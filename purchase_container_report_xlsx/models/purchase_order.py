@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import re
+
+from odoo import api, fields, models
+from odoo.tools import create_index
+
+# Purchase order fields copied into the container report dataset.
+CONTAINER_REPORT_FIELDS = {"name", "origin", "partner_id", "container_ids"}
+
+# Separators used between the source documents of an origin.
+ORIGIN_SEPARATORS = re.compile(r"[,;\s]+")
+
+
+class PurchaseOrder(models.Model):
+    _inherit = "purchase.order"
+
+    origin_sale_order_ids = fields.Many2many(
+        "sale.order", "purchase_order_origin_sale_order_rel",
+        "purchase_id", "sale_order_id",
+        string="Origin Sale Orders",
+        compute="_compute_origin_sale_order_ids", store=True,
+        help="Sale orders whose name is one of the source documents of the "
+        "origin.",
+    )
+
+    def init(self):
+        super().init()
+        # Serves the origin LIKE '%name%' prefilter of
+        # sale.order._recompute_origin_purchase_links().
+        if self.pool.has_trigram:
+            create_index(
+                self.env.cr, "purchase_order_origin_trgm_index", self._table,
+                ["origin gin_trgm_ops"], method="gin")
+
+    @api.depends("origin")
+    def _compute_origin_sale_order_ids(self):
+        tokens = {
+            order.id: set(filter(None, ORIGIN_SEPARATORS.split(order.origin or "")))
+            for order in self
+        }
+        names = set().union(*tokens.values())
+        sale_orders = self.env["sale.order"].sudo().search(
+            [("name", "in", list(names))]) if names else self.env["sale.order"]
+        ids_by_name = {}
+        for so in sale_orders:
+            ids_by_name.setdefault(so.name, []).append(so.id)
+        for order in self:
+            order.origin_sale_order_ids = [fields.Command.set([
+                so_id for name in tokens[order.id] for so_id in ids_by_name.get(name, [])
+            ])]
+
+    def _get_container_report_orders(self):
+        """Sale orders whose container report rows depend on these POs."""
+        return self.sudo().origin_sale_order_ids
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        orders = super().create(vals_list)
+        orders._get_container_report_orders()._mark_container_report_dirty()
+        return orders
+
+    def write(self, vals):
+        if not CONTAINER_REPORT_FIELDS.intersection(vals):
+            return super().write(vals)
+        sale_orders = self._get_container_report_orders()
+        res = super().write(vals)
+        (sale_orders | self._get_container_report_orders())._mark_container_report_dirty()
+        return res
+
+    def unlink(self):
+        sale_orders = self._get_container_report_orders()
+        res = super().unlink()
+        sale_orders._mark_container_report_dirty()
+        return res
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+
+# Partner fields shown in the container report vendor column (a contact's
+# name includes its company's).
+CONTAINER_REPORT_FIELDS = {"name", "parent_id"}
+
+
+class ResPartner(models.Model):
+    _inherit = "res.partner"
+
+    def write(self, vals):
+        res = super().write(vals)
+        if CONTAINER_REPORT_FIELDS.intersection(vals):
+            self.env["purchase.order"].sudo().search(
+                [("partner_id", "child_of", self.ids)]
+            )._get_container_report_orders()._mark_container_report_dirty()
+        return res
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+from odoo.tools import escape_psql
+
+from .purchase_order import ORIGIN_SEPARATORS
+
+# Sale order fields copied into the container report dataset.
+CONTAINER_REPORT_FIELDS = {"name", "date_order", "project_id"}
+
+
+def patch_container_report_hooks(model_class, get_orders, watched_fields=None):
+    """Flag the container report rows of the sale orders ``get_orders(records)``
+    when records of ``model_class`` are created, written or deleted.
+
+    For models this module cannot inherit, their name being only known at
+    runtime: ``model_class`` is their registry class. Writes only flag on
+    ``watched_fields``, if given.
+    """
+    if getattr(model_class, "_container_report_hooked", False):
+        return
+    model_class._container_report_hooked = True
+
+    @api.model_create_multi
+    def create(self, vals_list, **kwargs):
+        records = create.origin(self, vals_list, **kwargs)
+        get_orders(records)._mark_container_report_dirty()
+        return records
+
+    def write(self, vals, **kwargs):
+        if watched_fields is not None and not watched_fields.intersection(vals):
+            return write.origin(self, vals, **kwargs)
+        sale_orders = get_orders(self)
+        res = write.origin(self, vals, **kwargs)
+        (sale_orders | get_orders(self))._mark_container_report_dirty()
+        return res
+
+    def unlink(self, **kwargs):
+        sale_orders = get_orders(self)
+        res = unlink.origin(self, **kwargs)
+        sale_orders._mark_container_report_dirty()
+        return res
+
+    model_class._patch_method("create", create)
+    model_class._patch_method("write", write)
+    model_class._patch_method("unlink", unlink)
+
+
+class SaleOrder(models.Model):
+    _inherit = "sale.order"
+
+    container_report_dirty = fields.Boolean(
+        default=True, copy=False, index=True,
+        help="The container report dataset rows of this order are outdated "
+        "and will be rebuilt by the next report covering it.",
+    )
+
+    def _register_hook(self):
+        super()._register_hook()
+        # Projects come from sale_project, which this module does not depend on.
+        if "project_id" in self._fields:
+            patch_container_report_hooks(
+                self.env.registry[self._fields["project_id"].comodel_name],
+                lambda projects: projects.env["sale.order"].sudo().search(
+                    [("project_id", "in", projects.ids)]),
+                {"name"},
+            )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        orders = super().create(vals_list)
+        orders._recompute_origin_purchase_links()
+        return orders
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "name" in vals:
+            self._recompute_origin_purchase_links()
+        if CONTAINER_REPORT_FIELDS.intersection(vals):
+            self._mark_container_report_dirty()
+        return res
+
+    def _recompute_origin_purchase_links(self):
+        """Refresh the SO <-> PO origin links of POs that may mention these
+        orders (a PO can be created before the SO it refers to, or an SO can
+        be renamed)."""
+        PO = self.env["purchase.order"].sudo()
+        names = [name for name in self.mapped("name") if name]
+        if not names:
+            return
+        # Same rule as origin_sale_order_ids: the name is one of the origin's
+        # tokens. The LIKE prefilter lets the trigram index on the origin
+        # narrow the POs before they are split.
+        PO.flush_model(["origin"])
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT po.id
+              FROM purchase_order po
+             CROSS JOIN LATERAL regexp_split_to_table(po.origin, %s) AS token
+             WHERE po.origin LIKE ANY(%s)
+               AND token = ANY(%s)
+            """,
+            [
+                ORIGIN_SEPARATORS.pattern,
+                ["%%%s%%" % escape_psql(name) for name in names],
+                names,
+            ],
+        )
+        purchases = PO.browse([row[0] for row in self.env.cr.fetchall()]) | PO.search(
+            [("origin_sale_order_ids", "in", self.ids)])
+        self.env.add_to_compute(PO._fields["origin_sale_order_ids"], purchases)
+
+    def _set_container_report_dirty(self, dirty):
+        # Plain SQL: flagging must neither recurse into write() nor bump
+        # write_date.
+        if not self.ids:
+            return
+        self.env.cr.execute(
+            "UPDATE sale_order SET container_report_dirty = %s WHERE id IN %s",
+            [dirty, tuple(self.ids)],
+        )
+        self.invalidate_recordset(["container_report_dirty"])
+
+    def _mark_container_report_dirty(self):
+        self._set_container_report_dirty(True)
+
+    def _mark_container_report_clean(self):
+        self._set_container_report_dirty(False)
+
+    @api.model
+    def _get_container_report_orders_by_origin(self, origins):
+        """Sale orders whose name appears in one of ``origins``.
+
+        Mirrors the report matching rule for invoice origins: the name is a
+        case-sensitive substring of one of the comma separated source
+        documents. Every substring of those is looked up by exact name, so
+        the name index is used and no name is matched as a pattern.
+        """
+        candidates = set()
+        for origin in origins:
+            for token in (origin or "").split(","):
+                token = token.strip()
+                candidates.update(
+                    token[start:end]
+                    for start in range(len(token))
+                    for end in range(start + 1, len(token) + 1)
+                )
+        if not candidates:
+            return self.browse()
+        return self.sudo().search([("name", "in", list(candidates))])
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models
+
+# Move fields linking a picking's container to a PO.
+CONTAINER_REPORT_FIELDS = {"picking_id", "purchase_line_id"}
+
+
+class StockMove(models.Model):
+    _inherit = "stock.move"
+
+    def _get_container_report_orders(self):
+        """Sale orders whose container report rows show the containers of
+        these moves' pickings."""
+        moves = self.sudo().filtered(lambda move: move.picking_id.container_id)
+        return moves.purchase_line_id.order_id._get_container_report_orders()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        moves = super().create(vals_list)
+        moves._get_container_report_orders()._mark_container_report_dirty()
+        return moves
+
+    def write(self, vals):
+        if not CONTAINER_REPORT_FIELDS.intersection(vals):
+            return super().write(vals)
+        sale_orders = self._get_container_report_orders()
+        res = super().write(vals)
+        (sale_orders | self._get_container_report_orders())._mark_container_report_dirty()
+        return res
+
+    def unlink(self):
+        sale_orders = self._get_container_report_orders()
+        res = super().unlink()
+        sale_orders._mark_container_report_dirty()
+        return res
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from odoo import api, models
+
+
+class StockPicking(models.Model):
+    _inherit = "stock.picking"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        pickings = super().create(vals_list)
+        # Pickings created before their moves have no PO yet; their moves
+        # flag it when they are added (see stock.move).
+        pickings.sudo().filtered("container_id").purchase_id._get_container_report_orders(
+        )._mark_container_report_dirty()
+        return pickings
+
+    def write(self, vals):
+        if "container_id" not in vals:
+            return super().write(vals)
+        purchases = self.sudo().purchase_id
+        res = super().write(vals)
+        purchases._get_container_report_orders()._mark_container_report_dirty()
+        return res
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+
+# UoM fields shown in the container report unit column.
+CONTAINER_REPORT_FIELDS = {"name"}
+
+
+class UomUom(models.Model):
+    _inherit = "uom.uom"
+
+    def write(self, vals):
+        res = super().write(vals)
+        if CONTAINER_REPORT_FIELDS.intersection(vals):
+            self.env["purchase.container"].sudo().search(
+                [("product_summary_line_ids.uom_id", "in", self.ids)]
+            )._get_container_report_orders()._mark_container_report_dirty()
+        return res
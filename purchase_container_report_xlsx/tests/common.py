@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Synthetic container report data, shared by the tests and the benchmarks."""
+import datetime
+
+from odoo import Command
+
+# Records are created in batches of this size to bound memory at 100k scale.
+BATCH_SIZE = 1000
+
+
+def _batches(count):
+    for start in range(0, count, BATCH_SIZE):
+        yield range(start, min(start + BATCH_SIZE, count))
+
+
+def generate_container_report_data(
+    env, so_count, date_from, date_to, pos_per_so=1, containers_per_po=1,
+    lines_per_container=3, invoices_per_so=1, prefix="BENCH",
+):
+    """Create ``so_count`` sale orders spread over ``date_from..date_to``,
+    each with ``pos_per_so`` purchase orders linked by ``origin``, their
+    containers with product summary lines, and ``invoices_per_so`` draft
+    customer invoices whose ``invoice_origin`` is the sale order name.
+
+    Returns the created sale orders.
+    """
+    env = env(context=dict(env.context, tracking_disable=True, mail_create_nolog=True))
+    partner = env["res.partner"].create({"name": "%s Customer" % prefix})
+    vendor = env["res.partner"].create({"name": "%s Vendor" % prefix})
+    uom = env.ref("uom.product_uom_unit")
+    products = env["product.product"].create([
+        {"name": "%s Material %d" % (prefix, i), "uom_id": uom.id, "uom_po_id": uom.id}
+        for i in range(lines_per_container)
+    ])
+    PO = env["purchase.order"]
+    Container = env[PO._fields["container_ids"].comodel_name]
+    summary_field = Container._fields["product_summary_line_ids"]
+    SummaryLine = env[summary_field.comodel_name]
+
+    span = max((date_to - date_from).days, 0) + 1
+    sale_orders = env["sale.order"]
+    for batch in _batches(so_count):
+        batch_orders = env["sale.order"].create([{
+            "name": "%s/SO/%06d" % (prefix, i),
+            "partner_id": partner.id,
+            "date_order": datetime.datetime.combine(
+                date_from + datetime.timedelta(days=i % span), datetime.time(12)),
+            "order_line": [Command.create({
+                "product_id": products[0].id, "product_uom_qty": 1.0,
+            })],
+        } for i in batch])
+        containers = Container.create([{
+            "name": "%s/CONT/%s/%d/%d" % (prefix, so.name.rsplit("/", 1)[1], p, c),
+        } for so in batch_orders for p in range(pos_per_so) for c in range(containers_per_po)])
+        SummaryLine.create([{
+            summary_field.inverse_name: container.id,
+            "product_id": product.id,
+            "qty_ordered": 10.0 * (n + 1),
+            "uom_id": uom.id,
+        } for container in containers for n, product in enumerate(products)])
+        per_so = pos_per_so * containers_per_po
+        PO.create([{
+            "partner_id": vendor.id,
+            "origin": so.name,
+            "container_ids": [Command.set(
+                containers[s * per_so + p * containers_per_po:
+                           s * per_so + (p + 1) * containers_per_po].ids)],
+        } for s, so in enumerate(batch_orders) for p in range(pos_per_so)])
+        env["account.move"].create([{
+            "move_type": "out_invoice",
+            "partner_id": partner.id,
+            "invoice_origin": so.name,
+            "invoice_line_ids": [Command.create({
+                "product_id": products[0].id, "quantity": 1.0, "price_unit": 100.0,
+            })],
+        } for so in batch_orders for _i in range(invoices_per_so)])
+        sale_orders |= batch_orders
+        env.flush_all()
+        env.invalidate_all()
+    return sale_orders
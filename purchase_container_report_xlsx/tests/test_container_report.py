@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime
+
+from freezegun import freeze_time
+
+from odoo.tests import TransactionCase, tagged
+
+from .common import generate_container_report_data
+
+
+@tagged("post_install", "-at_install")
+class TestContainerReport(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.small = generate_container_report_data(
+            cls.env, 5, date(2025, 1, 1), date(2025, 1, 28),
+            pos_per_so=2, lines_per_container=3, invoices_per_so=2, prefix="SMALL")
+        cls.large = generate_container_report_data(
+            cls.env, 20, date(2025, 3, 1), date(2025, 3, 28),
+            pos_per_so=2, lines_per_container=3, invoices_per_so=2, prefix="LARGE")
+
+    def _wizard(self, date_from, date_to, output_format="csv"):
+        return self.env["purchase.container.report.wizard"].create({
+            "date_from": date_from,
+            "date_to": date_to,
+            "output_format": output_format,
+        })
+
+    def _read_csv(self, wizard):
+        output = io.BytesIO()
+        wizard._write_report(output)
+        return list(csv.reader(io.StringIO(output.getvalue().decode())))
+
+    def test_report_rows(self):
+        rows = self._read_csv(self._wizard(date(2025, 1, 1), date(2025, 1, 31)))
+        # 2 POs x 1 container x 3 lines, repeated for each of the 2 invoices.
+        self.assertEqual(len(rows) - 1, 5 * 2 * 3 * 2)
+        self.assertEqual({row[2] for row in rows[1:]}, set(self.small.mapped("name")))
+
+    def test_report_queries_do_not_scale_with_orders(self):
+        counts = []
+        for date_from, date_to in (
+            (date(2025, 1, 1), date(2025, 1, 31)),
+            (date(2025, 3, 1), date(2025, 3, 31)),
+        ):
+            wizard = self._wizard(date_from, date_to)
+            self.env.flush_all()
+            self.env.invalidate_all()
+            start = self.env.cr.sql_log_count
+            self._read_csv(wizard)
+            counts.append(self.env.cr.sql_log_count - start)
+        # 4x the sale orders must not mean 4x the queries.
+        self.assertLess(counts[1], counts[0] * 2)
+
+    def test_report_cache(self):
+        wizard = self._wizard(date(2025, 1, 1), date(2025, 1, 31), "xlsx")
+        entry = wizard._get_report_cache()
+        self.assertEqual(entry.file_size, len(entry.attachment_id.raw))
+        self.assertEqual(entry.attachment_id.file_size, entry.file_size)
+        self.assertEqual(wizard._get_report_cache(), entry)
+        self.assertEqual(entry.hit_count, 1)
+        self.small[0].write({"date_order": self.small[1].date_order})
+        self.assertNotEqual(wizard._get_report_cache(), entry)
+
+    def test_origin_purchase_links(self):
+        vendor = self.env["res.partner"].create({"name": "Origin Vendor"})
+        purchase = self.env["purchase.order"].create({
+            "partner_id": vendor.id, "origin": "ORIGIN/SO/10, OTHER",
+        })
+        sale_orders = self.env["sale.order"].create([{
+            "name": name, "partner_id": vendor.id,
+        } for name in ("ORIGIN/SO/1", "ORIGIN/SO/10")])
+        self.env.flush_all()
+        # A token is matched exactly, never as a prefix.
+        self.assertEqual(purchase.origin_sale_order_ids, sale_orders[1])
+
+    def test_report_dataset_renames(self):
+        Line = self.env["purchase.container.report.line"]
+        date_from, date_to = datetime(2025, 1, 1), datetime(2025, 1, 31)
+        fingerprint = Line._get_range_fingerprint(date_from, date_to)
+        self.assertEqual(Line._get_range_fingerprint(date_from, date_to), fingerprint)
+        product = self.env["product.product"].search(
+            [("name", "=", "SMALL Material 0")], limit=1)
+        product.name = "SMALL Renamed Material"
+        fingerprint, previous = Line._get_range_fingerprint(date_from, date_to), fingerprint
+        self.assertNotEqual(fingerprint, previous)
+        self.assertIn(
+            "SMALL Renamed Material",
+            {row["material"] for row in Line._read_range(date_from, date_to)})
+        # Summary lines edited directly, outside their container.
+        container = self.env["purchase.order"].search(
+            [("origin_sale_order_ids", "in", self.small[:1].ids)], limit=1).container_ids[:1]
+        container.product_summary_line_ids[:1].qty_ordered = 99.0
+        self.assertNotEqual(Line._get_range_fingerprint(date_from, date_to), fingerprint)
+        self.assertIn(99.0, {row["qty"] for row in Line._read_range(date_from, date_to)})
+
+    def test_report_stats(self):
+        Stat = self.env["purchase.container.report.stat"]
+        wizard = self._wizard(date(2025, 3, 1), date(2025, 3, 31), "xlsx")
+        wizard._get_report_cache()
+        stats = Stat.search([("date_from", "=", date(2025, 3, 1))])
+        self.assertFalse(any(stats.mapped("cache_hit")))
+        self.assertTrue({
+            "fetch SOs", "resolve POs", "resolve containers", "resolve invoices",
+            "store dataset", "read dataset", "write rows", "encode", "store",
+        } <= set(stats.mapped("stage")))
+        self.assertGreater(sum(stats.mapped("query_count")), 0)
+
+        wizard._get_report_cache()
+        hit = Stat.search([("date_from", "=", date(2025, 3, 1))]) - stats
+        self.assertTrue(all(hit.mapped("cache_hit")))
+        self.assertIn("cache lookup", hit.mapped("stage"))
+        self.assertNotIn("write rows", hit.mapped("stage"))
+
+    def test_report_totals(self):
+        Line = self.env["purchase.container.report.line"]
+        date_from, date_to = datetime(2025, 1, 1), datetime(2025, 1, 31)
+        wizard = self._wizard(date_from.date(), date_to.date(), "xlsx")
+        wizard.include_summary = True
+        wizard._write_report(io.BytesIO())
+        totals = Line._read_range_totals(date_from, date_to, ["so_name"])
+        self.assertEqual(len(totals), 5)
+        for group in totals:
+            # 2 POs x 1 container x lines of 10, 20 and 30.
+            self.assertEqual(group["__count"], 6)
+            self.assertAlmostEqual(group["qty"], 120.0)
+
+    def test_report_rows_many_invoices(self):
+        sale_orders = generate_container_report_data(
+            self.env, 2, date(2025, 5, 1), date(2025, 5, 2), pos_per_so=2,
+            containers_per_po=4, lines_per_container=3, invoices_per_so=6, prefix="MANY")
+        rows = self._read_csv(self._wizard(date(2025, 5, 1), date(2025, 5, 31)))[1:]
+        lines_per_so = 2 * 4 * 3
+        self.assertEqual(len(rows), len(sale_orders) * 6 * lines_per_so)
+        so_block = 6 * lines_per_so
+        for so_start in range(0, len(rows), so_block):
+            groups = [
+                rows[start:start + lines_per_so]
+                for start in range(so_start, so_start + so_block, lines_per_so)
+            ]
+            self.assertEqual(len({row[6] for row in rows[so_start:so_start + so_block]}), 6)
+            for group in groups:
+                # One invoice per group, Milagros/SqFt only on its first row.
+                self.assertEqual(len({(row[2], row[6]) for row in group}), 1)
+                self.assertTrue(group[0][13])
+                self.assertEqual(float(group[0][14]), 2 * 4 * (10.0 + 20.0 + 30.0))
+                self.assertFalse(any(row[13] or row[14] for row in group[1:]))
+                # The SO's lines, identically repeated for each invoice.
+                self.assertEqual(
+                    [row[:6] + row[7:13] for row in group],
+                    [row[:6] + row[7:13] for row in groups[0]])
+
+    def test_report_split(self):
+        self.env["ir.config_parameter"].sudo().set_param(
+            "purchase_container_report_xlsx.split_row_budget", 50)
+        generate_container_report_data(
+            self.env, 4, date(2025, 7, 30), date(2025, 8, 2), pos_per_so=2,
+            invoices_per_so=2, prefix="SPLIT")
+        wizard = self._wizard(date(2025, 7, 1), date(2025, 8, 31), "xlsx")
+        wizard.split_by = "month"
+        output = io.BytesIO()
+        wizard._write_report(output)
+        with zipfile.ZipFile(output) as workbook:
+            sheets = re.findall(r'name="([^"]+)"', workbook.read("xl/workbook.xml").decode())
+        # 12 rows per SO: 4 SOs per 50-row sheet, 2 SOs per month.
+        self.assertEqual(sheets, ["2025-07", "2025-08"])
+
+        self.env["ir.config_parameter"].sudo().set_param(
+            "purchase_container_report_xlsx.split_row_budget", 20)
+        wizard.output_format = "csv"
+        self.assertTrue(wizard._get_report_filename().endswith(".csv.zip"))
+        output = io.BytesIO()
+        wizard._write_report(output)
+        with zipfile.ZipFile(output) as archive:
+            names = archive.namelist()
+            rows = [
+                list(csv.reader(io.StringIO(archive.read(name).decode())))[1:]
+                for name in names
+            ]
+        # A 12-row SO is never cut to fit a 20-row file.
+        self.assertEqual(len(names), 4)
+        self.assertTrue(all(len(file_rows) == 12 for file_rows in rows))
+        self.assertTrue(names[0].endswith("_2025-07.csv"))
+        self.assertTrue(names[1].endswith("_2025-07_2.csv"))
+
+    def test_schedule_window(self):
+        schedule = self.env["purchase.container.report.schedule"].create({
+            "name": "Test", "window": "previous_month", "frequency": "monthly",
+        })
+        self.assertEqual(
+            schedule._get_window(date(2025, 3, 15)), (date(2025, 2, 1), date(2025, 2, 28)))
+        self.assertTrue(schedule._is_due(date(2025, 3, 1)))
+        self.assertFalse(schedule._is_due(date(2025, 3, 2)))
+        schedule.write({"window": "current_month"})
+        self.assertEqual(
+            schedule._get_window(date(2024, 2, 10)), (date(2024, 2, 1), date(2024, 2, 29)))
+        schedule.write({"window": "last_days", "days": 7})
+        self.assertEqual(
+            schedule._get_window(date(2025, 3, 3)), (date(2025, 2, 25), date(2025, 3, 3)))
+
+        # A pre-generated window is served from the cache.
+        entry = schedule._get_wizard()._get_report_cache()
+        self.assertEqual(schedule._get_wizard()._get_report_cache(), entry)
+        self.assertEqual(entry.hit_count, 1)
+
+    def test_schedule_timezone(self):
+        self.env.user.tz = "America/Mexico_City"
+        schedule = self.env["purchase.container.report.schedule"].create({
+            "name": "Test", "window": "last_days", "days": 7, "frequency": "monthly",
+            "sequence": 1,
+        })
+        # 03:00 UTC on March 1st is still February 28th in Mexico City.
+        with freeze_time("2025-03-01 03:00:00"):
+            self.assertFalse(schedule._is_pending())
+        with freeze_time("2025-03-01 09:00:00"):
+            self.assertTrue(schedule._is_pending())
+            schedule.last_run = datetime(2025, 3, 1, 8, 30)
+            self.assertFalse(schedule._is_pending())
+            # The wizard opens on a scheduled window, so it hits the cache.
+            schedule.frequency = "daily"
+            defaults = self.env["purchase.container.report.wizard"].default_get(
+                ["date_from", "date_to"])
+            self.assertEqual(
+                (defaults["date_from"], defaults["date_to"]),
+                (date(2025, 2, 23), date(2025, 3, 1)))
@@ -1,68 +1,865 @@
 # -*- coding: utf-8 -*-
-from odoo import fields, models, _
+import odoo
+from odoo import api, fields, models, _
 from odoo.exceptions import UserError
+from odoo.sql_db import Connection, ConnectionPool, connection_info_for
+from odoo.tools import escape_psql
 import io
-import base64
+import multiprocessing
+import re
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import groupby
+from operator import itemgetter
+import csv
 import xlsxwriter
 
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Quantity and SqFt use the number format, every other column after the
+# date is text (a blank SqFt cell only shows the shared border).
+NUMBER_COLUMNS = (9, 14)
+# Below this many sale orders per worker, forking costs more than it saves.
+MIN_SHARD_SIZE = 200
+
+# Machine-friendly column names (CSV header, Parquet schema), in sheet order.
+REPORT_COLUMNS = [
+    "date", "project", "so", "po", "status", "container", "invoice", "vendor",
+    "material", "quantity", "unit", "quantity_2", "unit_2", "milagros", "sqft",
+    "pablo", "odoo",
+]
+# format: (file extension, mimetype)
+REPORT_FORMATS = {
+    "xlsx": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("csv", "text/csv"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+# Worksheet row limit of the XLSX format, header row included.
+XLSX_MAX_ROWS = 1048576
+# Rows buffered per Parquet row group.
+PARQUET_BATCH_SIZE = 10000
+# Summary sheet sections: (title, dataset line fields grouped by, headers).
+SUMMARY_SECTIONS = [
+    ("Totals by SO", ["so_name", "project"], ["SO", "Project"]),
+    ("Totals by Container", ["container_name", "container_state"], ["Container", "Status"]),
+    ("Totals by Vendor", ["vendor"], ["Vendor"]),
+    ("Totals by Material", ["material", "uom"], ["Material", "Unit"]),
+]
+
+
+def _init_shard_worker():
+    """Drop the signal handlers inherited from the Odoo worker, so a shard
+    worker never runs the server's shutdown or time limit handlers."""
+    for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP, signal.SIGQUIT,
+                   signal.SIGXCPU, signal.SIGUSR1, signal.SIGUSR2, signal.SIGCHLD):
+        signal.signal(signum, signal.SIG_DFL)
+
+
+def _build_shard_values(dbname, uid, context, so_ids):
+    """Build the dataset values of one shard in a forked worker process.
+
+    The connections of the global pool are inherited through ``fork()`` and
+    still belong to the parent, so the shard opens its own connection from
+    a private pool.
+    """
+    db, info = connection_info_for(dbname)
+    pool = ConnectionPool(1)
+    try:
+        with Connection(pool, db, info).cursor() as cr:
+            env = api.Environment(cr, uid, context)
+            wizard = env["purchase.container.report.wizard"]
+            sale_orders = env["sale.order"].sudo().browse(so_ids)
+            data = wizard._prefetch_report_data(sale_orders)
+            return list(wizard._prepare_dataset_values(data, so_ids))
+    finally:
+        pool.close_all()
+
 
 class PurchaseContainerReportWizard(models.TransientModel):
     _name = "purchase.container.report.wizard"
     _description = "Purchase Container Excel Report Wizard"
 
-    date_from = fields.Date(string="Date From", required=True)
-    date_to = fields.Date(string="Date To", required=True)
+    date_from = fields.Date(
+        string="Date From", required=True,
+        default=lambda self: self._get_default_window()[0])
+    date_to = fields.Date(
+        string="Date To", required=True,
+        default=lambda self: self._get_default_window()[1])
+
+    output_format = fields.Selection([
+        ("xlsx", "Excel (XLSX)"),
+        ("csv", "CSV"),
+        ("parquet", "Parquet"),
+    ], string="Format", default="xlsx", required=True)
+    include_summary = fields.Boolean(
+        string="Summary Sheet",
+        help="Add a sheet with the SqFt totals per sale order, container, "
+        "vendor and material (Excel format only).",
+    )
+    split_by = fields.Selection([
+        ("none", "Row Budget Only"),
+        ("month", "Month"),
+        ("vendor", "Vendor"),
+    ], string="Split By", default="none", required=True,
+        help="Start a new sheet or file for each month or vendor. Sheets and "
+        "files are also cut at the configured row budget.")
+    split_output = fields.Selection([
+        ("sheet", "Worksheets"),
+        ("zip", "Zipped Files"),
+    ], string="Split Into", default="sheet", required=True,
+        help="Excel only: split into worksheets of one workbook, or into "
+        "separate workbooks in a zip archive. CSV and Parquet are zipped "
+        "whenever they are split.")
+    stream_download = fields.Boolean(
+        string="Streaming Download",
+        help="Write the file row by row to a temporary file and download "
+        "it directly, without storing the file on the wizard.",
+    )
 
-    file_data = fields.Binary(string="File", readonly=True)
-    file_name = fields.Char(string="Filename", readonly=True)
+    def _get_default_window(self):
+        """Window of the company's report schedule, daily ones first, so the
+        report opened by default is served from the pre-generated cache."""
+        Schedule = self.env["purchase.container.report.schedule"]
+        domain = [("company_id", "=", self.env.company.id)]
+        schedule = Schedule.search(domain + [("frequency", "=", "daily")], limit=1) or (
+            Schedule.search(domain, limit=1))
+        if not schedule:
+            return False, False
+        return schedule._get_window(fields.Date.context_today(self))
 
     def _get_out_invoices_for_so(self, so):
         """Return customer invoices linked to the SO (best-effort)."""
-        Move = self.env["account.move"].sudo()
-        domain = [
-            ("move_type", "=", "out_invoice"),
-            ("state", "!=", "cancel"),
-        ]
-        invoices = Move.search(domain).filtered(
-            lambda m: (
-                so in m.invoice_line_ids.mapped("sale_line_ids.order_id")
-            ) or (
-                m.invoice_origin and so.name in m.invoice_origin
-            )
-        )
-        return invoices
+        invoices = self._get_out_invoices_by_so(so)
+        return self.env["account.move"].sudo().browse(
+            [inv_id for inv_id, _name in invoices.get(so.id, [])])
 
     def _find_purchase_orders_for_so(self, so):
-        """purchase_sale_link_by_origin behavior: PO.origin contains SO name."""
+        """purchase_sale_link_by_origin behavior: SO name is a token of PO.origin."""
         PO = self.env["purchase.order"].sudo()
-        return PO.search([("origin", "ilike", so.name)])
+        return PO.search([("origin_sale_order_ids", "in", so.ids)])
 
-    def _state_label(self, container):
-        return dict(container._fields["state"].selection).get(container.state, container.state or "")
+    def _state_label(self, container, labels=None):
+        return self._get_selection_label(
+            container._name, "state", container.state, {} if labels is None else labels)
 
-    def action_generate_excel(self):
-        self.ensure_one()
-        if self.date_from > self.date_to:
-            raise UserError(_("Date From must be before Date To."))
+    @contextmanager
+    def _report_stage(self, name):
+        """Measure the enclosed report stage: query count, SQL time and the
+        remaining (Python) time are appended to the ``container_report_stats``
+        list of the context, if any. Stages nested inside are recorded on
+        their own and left out of the enclosing stage's figures."""
+        stats = self.env.context.get("container_report_stats")
+        if stats is None:
+            yield
+            return
+        # The HTTP server resets these per request; other threads (cron,
+        # shell) only get them here.
+        thread = threading.current_thread()
+        if not hasattr(thread, "query_count"):
+            thread.query_count = 0
+            thread.query_time = 0.0
+        query_count, query_time = thread.query_count, thread.query_time
+        start = time.perf_counter()
+        mark = len(stats)
+        try:
+            yield
+        finally:
+            # Recorded figures are exclusive, so the inner stages' totals are
+            # the plain sum of everything appended since ``mark``.
+            inner = stats[mark:]
+            inner_sql_time = sum(stage["sql_time"] for stage in inner)
+            sql_time = thread.query_time - query_time - inner_sql_time
+            stats.append({
+                "stage": name,
+                "query_count": thread.query_count - query_count - sum(
+                    stage["query_count"] for stage in inner),
+                "sql_time": sql_time,
+                "python_time": time.perf_counter() - start - sql_time - inner_sql_time - sum(
+                    stage["python_time"] for stage in inner),
+            })
+
+    def _get_selection_label(self, model_name, field_name, value, labels):
+        """Label of a selection value, the mapping being built once per
+        report and kept in the ``labels`` memo."""
+        key = (model_name, field_name)
+        if key not in labels:
+            labels[key] = dict(self.env[model_name]._fields[field_name].selection)
+        return labels[key].get(value, value or "")
+
+    def _get_display_names(self, model_name, ids, labels):
+        """Return ``{id: display_name}`` for ``ids``, reading each record at
+        most once per report through the ``labels`` memo."""
+        names = labels.setdefault(model_name, {})
+        missing = [rid for rid in dict.fromkeys(ids) if rid and rid not in names]
+        if missing:
+            for rec in self.env[model_name].sudo().browse(missing).read(["display_name"]):
+                names[rec["id"]] = rec["display_name"]
+        return names
+
+    def _prefetch_report_data(self, sale_orders):
+        """Load everything the row writer needs for ``sale_orders`` in bulk.
+
+        POs, containers, summary lines, products, UoMs and invoices are read
+        for the whole date range in a fixed number of queries, and returned
+        as plain lookup maps keyed by SO id, so the writing loop never has to
+        touch the ORM.
+        """
+        so_ids = sale_orders.ids
+        # Report-scoped memo of display names and selection labels.
+        labels = {}
+        with self._report_stage("fetch SOs"):
+            so_rows = sale_orders.read(["name", "date_order"])
+            so_names = {so["id"]: so["name"] or "" for so in so_rows}
+            data = {
+                "so_names": so_names,
+                "date_orders": {so["id"]: so["date_order"] for so in so_rows},
+                "projects": {},
+                "po_names": {},
+                "vendors": {},
+                "containers": {},
+                "container_info": {},
+                "lines": {},
+                "invoices": {},
+            }
+            if not so_ids:
+                return data
+
+            if "project_id" in sale_orders._fields:
+                so_projects = {so["id"]: so["project_id"] for so in sale_orders.read(
+                    ["project_id"], load=None)}
+                projects = self._get_display_names(
+                    sale_orders._fields["project_id"].comodel_name, so_projects.values(), labels)
+                for so_id, project_id in so_projects.items():
+                    data["projects"][so_id] = projects[project_id] if project_id else ""
+
+        # Purchase orders: one probe of the SO <-> PO origin link index.
+        with self._report_stage("resolve POs"):
+            PO = self.env["purchase.order"].sudo()
+            pos = PO.search([("origin_sale_order_ids", "in", so_ids)])
+            po_rows = pos.read([
+                "name", "origin_sale_order_ids", "partner_id", "container_ids", "picking_ids",
+            ], load=None)
+            partners = self._get_display_names(
+                "res.partner", [po["partner_id"] for po in po_rows], labels)
+            pickings = self.env["stock.picking"].sudo().browse(
+                {pid for po in po_rows for pid in po["picking_ids"]}
+            )
+            picking_container = {
+                p["id"]: p["container_id"]
+                for p in pickings.read(["container_id"], load=None)
+                if p["container_id"]
+            }
+
+            pos_by_so_id = {so_id: [] for so_id in so_ids}
+            for po in po_rows:
+                for so_id in po["origin_sale_order_ids"]:
+                    if so_id in pos_by_so_id:
+                        pos_by_so_id[so_id].append(po)
+
+            container_ids = []
+            for so_id in so_ids:
+                so_pos = pos_by_so_id[so_id]
+                data["po_names"][so_id] = ", ".join(po["name"] for po in so_pos)
+                data["vendors"][so_id] = ", ".join(sorted(
+                    {partners[po["partner_id"]] for po in so_pos if po["partner_id"]}))
+                containers = list(dict.fromkeys(
+                    cid for po in so_pos for cid in po["container_ids"]))
+                if not containers:
+                    containers = list(dict.fromkeys(
+                        picking_container[pid]
+                        for po in so_pos for pid in po["picking_ids"]
+                        if pid in picking_container
+                    ))
+                data["containers"][so_id] = containers
+                container_ids.extend(containers)
+
+        # Containers and their product summary lines.
+        with self._report_stage("resolve containers"):
+            Container = self.env[PO._fields["container_ids"].comodel_name].sudo()
+            containers = Container.browse(list(dict.fromkeys(container_ids)))
+            line_ids = []
+            for container in containers.read(["name", "state", "product_summary_line_ids"]):
+                state_label = self._get_selection_label(
+                    Container._name, "state", container["state"], labels)
+                data["container_info"][container["id"]] = (container["name"] or "", state_label)
+                data["lines"][container["id"]] = container["product_summary_line_ids"]
+                line_ids.extend(container["product_summary_line_ids"])
+
+            Line = self.env[Container._fields["product_summary_line_ids"].comodel_name].sudo()
+            line_rows = Line.browse(line_ids).read(
+                ["product_id", "qty_ordered", "uom_id"], load=None)
+            products = self._get_display_names(
+                Line._fields["product_id"].comodel_name,
+                [line["product_id"] for line in line_rows], labels)
+            uoms = self._get_display_names(
+                Line._fields["uom_id"].comodel_name, [line["uom_id"] for line in line_rows], labels)
+            line_values = {
+                line["id"]: (
+                    products[line["product_id"]] if line["product_id"] else False,
+                    line["qty_ordered"] or 0.0,
+                    uoms[line["uom_id"]] if line["uom_id"] else "",
+                )
+                for line in line_rows
+            }
+            for container_id, ids in data["lines"].items():
+                data["lines"][container_id] = [line_values[lid] for lid in ids]
+
+        with self._report_stage("resolve invoices"):
+            data["invoices"] = self._get_out_invoices_by_so(sale_orders)
+        return data
 
+    def _get_out_invoices_by_so(self, sale_orders):
+        """Resolve customer invoices for all ``sale_orders`` at once.
+
+        Same rule as :meth:`_get_out_invoices_for_so` (an invoice line is
+        linked to one of the SO lines, or the SO name appears in
+        ``invoice_origin``), but answered with two queries for all orders
+        instead of scanning every customer invoice once per order.
+
+        The origin query is an unanchored ``ILIKE`` per SO name, served by
+        the trigram index on ``invoice_origin`` when ``pg_trgm`` is available
+        (a sequential scan of ``account_move`` otherwise). It is only a
+        candidate filter: being case-insensitive it over-matches, and the
+        candidates are narrowed by :meth:`_names_in_token` to the historical
+        case-sensitive substring rule. That rule matches prefixes too (an
+        origin ``SO10`` lists the invoice under ``SO1`` as well).
+
+        Returns ``{so_id: [(invoice_id, invoice_name), ...]}`` with invoices
+        in the default ``account.move`` order.
+        """
+        cr = self.env.cr
+        so_names = {so["id"]: so["name"] or "" for so in sale_orders.read(["name"])}
+        if not so_names:
+            return {}
+        invoice_ids = {so_id: set() for so_id in so_names}
+        for model in ("sale.order.line", "account.move.line", "account.move"):
+            self.env[model].flush_model()
+
+        cr.execute(
+            """
+            SELECT DISTINCT sol.order_id, am.id
+              FROM sale_order_line_invoice_rel rel
+              JOIN sale_order_line sol ON sol.id = rel.order_line_id
+              JOIN account_move_line aml ON aml.id = rel.invoice_line_id
+              JOIN account_move am ON am.id = aml.move_id
+             WHERE sol.order_id IN %s
+               AND aml.display_type IN ('product', 'line_section', 'line_note')
+               AND am.move_type = 'out_invoice'
+               AND am.state != 'cancel'
+            """,
+            [tuple(so_names)],
+        )
+        for so_id, move_id in cr.fetchall():
+            invoice_ids[so_id].add(move_id)
+
+        ids_by_name = {}
+        for so_id, name in so_names.items():
+            if name:
+                ids_by_name.setdefault(name, []).append(so_id)
+        if ids_by_name:
+            cr.execute(
+                """
+                SELECT id, invoice_origin
+                  FROM account_move
+                 WHERE move_type = 'out_invoice'
+                   AND state != 'cancel'
+                   AND invoice_origin ILIKE ANY(%s)
+                """,
+                [["%%%s%%" % escape_psql(name) for name in ids_by_name]],
+            )
+            for token, move_ids in self._index_origin_tokens(cr.fetchall()).items():
+                for name in self._names_in_token(token, ids_by_name):
+                    for so_id in ids_by_name[name]:
+                        invoice_ids[so_id].update(move_ids)
+
+        all_ids = set().union(*invoice_ids.values())
+        moves = self.env["account.move"].sudo().search_read(
+            [("id", "in", list(all_ids))], ["name"])
+        return {
+            so_id: [(m["id"], m["name"]) for m in moves if m["id"] in invoice_ids[so_id]]
+            for so_id in so_names
+        }
+
+    def _index_origin_tokens(self, origins):
+        """Build ``{token: {move_id, ...}}`` from ``(move_id, origin)`` pairs.
+
+        ``invoice_origin`` holds a comma separated list of source documents.
+        """
+        index = {}
+        for move_id, origin in origins:
+            for token in (origin or "").split(","):
+                token = token.strip()
+                if token:
+                    index.setdefault(token, set()).add(move_id)
+        return index
+
+    def _names_in_token(self, token, names):
+        """Return the ``names`` contained in ``token``.
+
+        A token equal to an SO name is the common case; the sliding window
+        keeps the historical substring semantics of the origin match (SO
+        names never contain a comma, so a match never spans two tokens).
+        """
+        found = set()
+        for size in {len(name) for name in names}:
+            for start in range(len(token) - size + 1):
+                chunk = token[start:start + size]
+                if chunk in names:
+                    found.add(chunk)
+        return found
+
+    def _get_report_so_domain(self):
         # SALES ORDERS filter (by date_order).
         # If you want invoice_date instead, change this domain.
-        SO = self.env["sale.order"].sudo()
-        so_domain = [
+        return [
             ("date_order", ">=", fields.Datetime.to_datetime(self.date_from)),
             ("date_order", "<=", fields.Datetime.to_datetime(self.date_to)),
         ]
-        sale_orders = SO.search(so_domain, order="date_order, id")
 
-        output = io.BytesIO()
-        wb = xlsxwriter.Workbook(output, {"in_memory": True})
-        ws = wb.add_worksheet("Report")
+    def _get_report_sale_orders(self):
+        SO = self.env["sale.order"].sudo()
+        return SO.search(self._get_report_so_domain(), order="date_order, id")
+
+    def _get_async_threshold(self):
+        """Sale order count above which the report runs as a background job."""
+        return int(self.env["ir.config_parameter"].sudo().get_param(
+            "purchase_container_report_xlsx.async_threshold", 2000))
+
+    def _estimate_sale_order_count(self):
+        SO = self.env["sale.order"].sudo()
+        return SO.search_count(self._get_report_so_domain())
+
+    def _queue_report_job(self):
+        job = self.env["purchase.container.report.job"].create({
+            "name": "%s - %s" % (self.date_from, self.date_to),
+            "date_from": self.date_from,
+            "date_to": self.date_to,
+            "output_format": self.output_format,
+            "include_summary": self.include_summary,
+            "split_by": self.split_by,
+            "split_output": self.split_output,
+        })
+        job._trigger_runner()
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Container Excel Report"),
+                "message": _(
+                    "This date range is large, the report is being generated in "
+                    "the background. You will be notified when it is ready in "
+                    "Purchase > Reporting > Container Report Jobs."),
+                "sticky": False,
+                "next": {"type": "ir.actions.act_window_close"},
+            },
+        }
+
+    def _is_split_into_files(self):
+        """Whether the report is a zip of one file per part."""
+        if self.output_format == "xlsx":
+            return self.split_output == "zip"
+        return self.split_by != "none"
+
+    def _get_report_filename(self):
+        extension = REPORT_FORMATS[self.output_format][0]
+        if self._is_split_into_files():
+            extension = "%s.zip" % extension
+        return "reporte_contenedores_%s_%s.%s" % (self.date_from, self.date_to, extension)
+
+    def _get_report_mimetype(self):
+        if self._is_split_into_files():
+            return "application/zip"
+        return REPORT_FORMATS[self.output_format][1]
+
+    def _write_report(self, output, constant_memory=False):
+        """Serialize the report rows into ``output`` (a binary file object)
+        in the wizard's ``output_format``.
+
+        XLSX is held in memory unless ``constant_memory`` is set; CSV and
+        Parquet always stream.
+        """
+        self.ensure_one()
+        if self._is_split_into_files():
+            return self._write_report_zip(output, constant_memory)
+        if self.output_format == "csv":
+            return self._write_report_csv(output)
+        if self.output_format == "parquet":
+            return self._write_report_parquet(output)
+        options = {"constant_memory": True} if constant_memory else {"in_memory": True}
+        return self._write_report_xlsx(output, options)
+
+    def _write_report_zip(self, output, constant_memory=False):
+        """Write one file per report part into a zip archive.
+
+        Each part is written to a temporary file, then copied into the
+        archive, so only one part is ever being built at a time.
+        """
+        today = fields.Date.to_date(fields.Date.context_today(self))
+        extension = REPORT_FORMATS[self.output_format][0]
+        prefix = "reporte_contenedores_%s_%s" % (self.date_from, self.date_to)
+        names = set()
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+            for part, rows in self._iter_report_part_rows(today):
+                label = re.sub(r"[^\w.-]+", "_", self._get_part_label(part)).strip("_")
+                name, suffix = "%s_%s.%s" % (prefix, label, extension), 1
+                while name in names:
+                    suffix += 1
+                    name = "%s_%s_%d.%s" % (prefix, label, suffix, extension)
+                names.add(name)
+                with tempfile.TemporaryFile() as report:
+                    if self.output_format == "csv":
+                        self._write_report_csv(report, rows)
+                    elif self.output_format == "parquet":
+                        self._write_report_parquet(report, rows)
+                    else:
+                        self._write_report_xlsx(
+                            report, {"constant_memory": True}, parts=[(part, rows)])
+                    self._add_to_archive(archive, name, report)
+            if self.output_format == "xlsx" and self.include_summary:
+                with tempfile.TemporaryFile() as report:
+                    self._write_summary_xlsx(report)
+                    self._add_to_archive(archive, "%s_summary.xlsx" % prefix, report)
+
+    def _add_to_archive(self, archive, name, report):
+        with self._report_stage("archive"):
+            report.seek(0)
+            with archive.open(name, "w") as member:
+                shutil.copyfileobj(report, member)
+
+    def _get_report_cache(self, constant_memory=False):
+        """Return the ``purchase.container.report.cache`` entry holding the
+        report file, generating and storing it on a cache miss."""
+        self.ensure_one()
+        stats = []
+        self = self.with_context(container_report_stats=stats)
+        Cache = self.env["purchase.container.report.cache"].sudo()
+        report_date = fields.Date.context_today(self)
+        fingerprint = self.env["purchase.container.report.line"]._get_range_fingerprint(
+            fields.Datetime.to_datetime(self.date_from),
+            fields.Datetime.to_datetime(self.date_to),
+        )
+        with self._report_stage("cache lookup"):
+            entry = Cache._lookup(self, report_date, fingerprint)
+        cache_hit = bool(entry)
+        if not cache_hit:
+            with tempfile.TemporaryFile() as report:
+                self._write_report(report, constant_memory=constant_memory)
+                with self._report_stage("store"):
+                    entry = Cache._store(self, report_date, fingerprint, report)
+        self.env["purchase.container.report.stat"]._record(
+            self, uuid.uuid4().hex, stats, cache_hit)
+        return entry
+
+    def _write_report_csv(self, output, rows=None):
+        if rows is None:
+            rows = self._get_report_rows(
+                fields.Date.to_date(fields.Date.context_today(self)))
+        stream = io.TextIOWrapper(output, encoding="utf-8", newline="")
+        writer = csv.writer(stream)
+        with self._report_stage("write rows"):
+            writer.writerow(REPORT_COLUMNS)
+            writer.writerows(rows)
+        with self._report_stage("encode"):
+            stream.flush()
+            # Hand ``output`` back to the caller open.
+            stream.detach()
+
+    def _write_report_parquet(self, output, rows=None):
+        if pyarrow is None:
+            raise UserError(_(
+                "The Parquet format requires the pyarrow Python library."))
+        schema = pyarrow.schema([
+            (name, pyarrow.date32() if name == "date"
+             else pyarrow.int64() if name == "invoice"
+             else pyarrow.float64() if name in ("quantity", "sqft")
+             else pyarrow.string())
+            for name in REPORT_COLUMNS
+        ])
+        writer = pyarrow.parquet.ParquetWriter(output, schema)
+
+        def write_batch(batch):
+            # Blank cells (and False from empty char fields) become nulls.
+            columns = [
+                [None if value is False or value == "" else value for value in column]
+                for column in zip(*batch)
+            ]
+            writer.write_table(pyarrow.Table.from_arrays(columns, schema=schema))
+
+        if rows is None:
+            rows = self._get_report_rows(
+                fields.Date.to_date(fields.Date.context_today(self)))
+        with self._report_stage("write rows"):
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= PARQUET_BATCH_SIZE:
+                    write_batch(batch)
+                    batch = []
+            if batch:
+                write_batch(batch)
+        with self._report_stage("encode"):
+            writer.close()
+
+    def _prepare_dataset_values(self, data, so_ids):
+        """Yield one ``purchase.container.report.line`` value dict per
+        container product line of ``so_ids``.
+
+        ``data`` is the result of :meth:`_prefetch_report_data`; nothing here
+        touches the ORM.
+        """
+        for so_id in so_ids:
+            so_values = {
+                "sale_order_id": so_id,
+                "date_order": data["date_orders"][so_id],
+                "so_name": data["so_names"][so_id],
+                "project": data["projects"].get(so_id, ""),
+                "po_names": data["po_names"][so_id],
+                "vendor": data["vendors"][so_id],
+                "invoice_data": [list(inv) for inv in data["invoices"][so_id]],
+            }
+            sequence = 0
+            # Lines: 1 row per product_summary_line in each related container
+            for container in data["containers"][so_id]:
+                container_name, state_label = data["container_info"][container]
+                for material, qty, uom in data["lines"][container]:
+                    sequence += 1
+                    yield dict(
+                        so_values,
+                        sequence=sequence,
+                        container_name=container_name,
+                        container_state=state_label,
+                        material=material or "",
+                        qty=qty,
+                        uom=uom,
+                    )
+
+    def _get_report_workers(self):
+        """Number of processes used to build the report dataset."""
+        return max(1, int(self.env["ir.config_parameter"].sudo().get_param(
+            "purchase_container_report_xlsx.report_workers", 1)))
+
+    def _can_fork(self):
+        """Whether this process may fork the dataset shard workers."""
+        return not odoo.evented and threading.active_count() == 1
+
+    def _build_dataset_values(self, sale_orders, workers=None):
+        """Return the dataset line values of ``sale_orders``, in order.
+
+        With more than one worker the ordered sale orders are cut into
+        contiguous shards, each built by a forked process on its own cursor;
+        shard results are concatenated in order, which keeps the global
+        ``date_order, id`` ordering. Forked workers only see committed data,
+        so the serial path is used in test mode.
+
+        Forking is only safe from a single-threaded process (a prefork HTTP
+        or cron worker, or a shell): the children of a threaded or gevent
+        server would inherit locks held by its other threads (logging,
+        registry, connection pool). The serial path is used there too.
+        """
+        if workers is None:
+            workers = self._get_report_workers()
+        so_ids = sale_orders.ids
+        workers = min(workers, len(so_ids) // MIN_SHARD_SIZE)
+        if workers <= 1 or self.env.registry.in_test_mode() or not self._can_fork():
+            data = self._prefetch_report_data(sale_orders)
+            return list(self._prepare_dataset_values(data, so_ids))
+
+        size = -(-len(so_ids) // workers)
+        shards = [so_ids[i:i + size] for i in range(0, len(so_ids), size)]
+        args = [
+            (self.env.cr.dbname, self.env.uid, dict(self.env.context), shard)
+            for shard in shards
+        ]
+        # Stages run inside the workers are not collected; the whole pool
+        # is measured from here.
+        with self._report_stage("build shards"), ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_shard_worker,
+        ) as pool:
+            results = list(pool.map(_build_shard_values, *zip(*args)))
+        return [values for shard_values in results for values in shard_values]
+
+    def _get_report_lines(self):
+        """Bring the pre-joined ``purchase.container.report.line`` dataset up
+        to date for the wizard's range and stream its rows back, ordered by
+        vendor first when splitting by vendor."""
+        self.ensure_one()
+        Line = self.env["purchase.container.report.line"]
+        date_from = fields.Datetime.to_datetime(self.date_from)
+        date_to = fields.Datetime.to_datetime(self.date_to)
+        Line._refresh_range(date_from, date_to)
+        return Line._iter_range(date_from, date_to, by_vendor=self.split_by == "vendor")
+
+    def _get_report_rows(self, today):
+        """Yield the report rows of the wizard's date range as tuples of cell
+        values."""
+        return self._iter_report_rows(self._get_report_lines(), today)
+
+    def _iter_report_rows(self, lines, today):
+        """Turn dataset lines (ordered by SO) into report rows."""
+        for _so_id, so_lines in groupby(lines, key=itemgetter("sale_order_id")):
+            yield from self._get_so_report_rows(list(so_lines), today)
+
+    def _get_so_report_rows(self, so_lines, today):
+        """Return the report rows of the dataset lines of one SO.
+
+        If the SO has invoices, rows are grouped by invoice so Milagros/SqFt
+        appear once per invoice; if not, rows are printed without grouping.
+        """
+        blank = ("", "", "", "")
+        # The cells before and after the "Invoice" column, resolved once
+        # per SO and reused by every invoice group.
+        cells = [(
+            (today, line["project"], line["so_name"], line["po_names"],
+             line["container_state"], line["container_name"]),
+            (line["vendor"], line["material"], line["qty"], line["uom"], "", ""),
+        ) for line in so_lines]
+        invoices = so_lines[0]["invoice_data"]
+        if not invoices:
+            return [head + ("",) + tail + blank for head, tail in cells]
+        rows = []
+        # SqFt total is known up front so rows are written strictly
+        # in order (required by the constant_memory mode).
+        sqft_sum = sum(line["qty"] for line in so_lines)
+        (first_head, first_tail), other_cells = cells[0], cells[1:]
+        for inv_id, inv_name in invoices:
+            # "Invoice" column: numeric reference like sample file (we use invoice id).
+            invoice = (inv_id,)
+            # Milagros/SqFt only on the first row of the invoice group.
+            rows.append(first_head + invoice + first_tail + (inv_name or "", sqft_sum, "", ""))
+            rows.extend(head + invoice + tail + blank for head, tail in other_cells)
+        return rows
+
+    def _get_split_row_budget(self):
+        """Maximum number of rows per sheet or file of a split report."""
+        budget = int(self.env["ir.config_parameter"].sudo().get_param(
+            "purchase_container_report_xlsx.split_row_budget", 200000))
+        if self.output_format == "xlsx":
+            budget = min(budget, XLSX_MAX_ROWS - 1)
+        return max(1, budget)
+
+    def _get_split_group(self, line):
+        if self.split_by == "month":
+            return line["date_order"].strftime("%Y-%m")
+        if self.split_by == "vendor":
+            # Not translated: cached files are shared by all users.
+            return line["vendor"] or "No Vendor"
+        return ""
+
+    def _get_report_parts(self, today):
+        """Yield ``(part, rows)`` for each SO of the report, ``part`` being
+        a ``(split group, page)`` pair.
+
+        Parts are decided on the fly while the dataset streams by: a new
+        part starts when the split group changes or when the SO's rows would
+        take the current part over the row budget. An SO is only cut across
+        parts when it alone exceeds the budget.
+        """
+        budget = self._get_split_row_budget()
+        part, count = None, 0
+        for _so_id, so_lines in groupby(
+            self._get_report_lines(), key=itemgetter("sale_order_id"),
+        ):
+            so_lines = list(so_lines)
+            group = self._get_split_group(so_lines[0])
+            if part is None or part[0] != group:
+                part, count = (group, 1), 0
+            rows = self._get_so_report_rows(so_lines, today)
+            for start in range(0, len(rows), budget):
+                chunk = rows[start:start + budget]
+                if count and count + len(chunk) > budget:
+                    part, count = (group, part[1] + 1), 0
+                count += len(chunk)
+                yield part, chunk
+
+    def _iter_report_part_rows(self, today):
+        """Yield ``(part, rows)`` once per part, ``rows`` being a lazy
+        iterator to consume before moving to the next part."""
+        for part, chunks in groupby(self._get_report_parts(today), key=itemgetter(0)):
+            yield part, (row for _part, chunk in chunks for row in chunk)
+
+    def _get_part_label(self, part):
+        group, page = part
+        if not group:
+            return "Report" if page == 1 else "Report %d" % page
+        return group if page == 1 else "%s (%d)" % (group, page)
+
+    def _write_report_xlsx(self, output, workbook_options, parts=None):
+        """Write the report workbook into ``output`` (a path or file object).
+
+        ``workbook_options`` are passed to :class:`xlsxwriter.Workbook`; rows
+        are always written in order so ``constant_memory`` can be used.
+        Each of the ``parts`` (``(part, rows)`` pairs, by default the whole
+        report split at the row budget) is written on its own worksheet.
+        """
+        self.ensure_one()
+        wb = xlsxwriter.Workbook(output, workbook_options)
 
         headers = [
             "Date", "Project", "SO", "PO", "Status", "Container", "Invoice", "Vendor",
             "Material", "Quantity", "Unit", "Quantity", "Unit", "Milagros", "SqFt", "Pablo", "Odoo"
         ]
 
+        header_fmt, text_fmt, num_fmt, date_fmt = self._add_xlsx_formats(wb)
+
+        today = fields.Date.to_date(fields.Date.context_today(self))
+
+        # Consecutive columns sharing a format are written with a single
+        # write_row() call; the runs are computed once per report.
+        column_formats = [date_fmt] + [
+            num_fmt if col in NUMBER_COLUMNS else text_fmt
+            for col in range(1, len(headers))
+        ]
+        runs = []
+        for col, fmt in enumerate(column_formats):
+            if runs and runs[-1][2] is fmt:
+                runs[-1][1] = col + 1
+            else:
+                runs.append([col, col + 1, fmt])
+
+        # Parts given by the caller are files of a zipped report, which has
+        # its summary in a file of its own.
+        with_summary = parts is None and self.include_summary
+        if parts is None:
+            parts = self._iter_report_part_rows(today)
+        sheet_names = set()
+        with self._report_stage("write rows"):
+            for part, rows in parts:
+                ws = wb.add_worksheet(self._get_sheet_name(part, sheet_names))
+                ws.freeze_panes(1, 0)
+                ws.set_row(0, 18)
+                ws.set_column(0, len(headers) - 1, 13)
+                ws.write_row(0, 0, headers, header_fmt)
+                row = 1
+                for values in rows:
+                    for first, last, fmt in runs:
+                        ws.write_row(row, first, values[first:last], fmt)
+                    row += 1
+            if not sheet_names:
+                # Empty range: still hand out a workbook with its headers.
+                ws = wb.add_worksheet("Report")
+                ws.write_row(0, 0, headers, header_fmt)
+
+        if with_summary:
+            self._write_summary_sheet(wb, header_fmt, text_fmt, num_fmt)
+
+        with self._report_stage("encode"):
+            wb.close()
+
+    def _add_xlsx_formats(self, wb):
+        """Add the report cell formats to ``wb``: header, text, number and
+        date formats."""
         header_fmt = wb.add_format({
             "bold": True, "align": "center", "valign": "vcenter",
             "border": 1, "bg_color": "#D9D9D9"
@@ -72,127 +869,66 @@ class PurchaseContainerReportWizard(models.TransientModel):
             {"border": 1, "valign": "vcenter", "num_format": "#,##0.00"})
         date_fmt = wb.add_format(
             {"border": 1, "valign": "vcenter", "num_format": "yyyy-mm-dd"})
+        return header_fmt, text_fmt, num_fmt, date_fmt
 
-        ws.freeze_panes(1, 0)
-        ws.set_row(0, 18)
-        ws.set_column(0, len(headers) - 1, 13)
-
-        for col, h in enumerate(headers):
-            ws.write(0, col, h, header_fmt)
-
-        row = 1
-        today = fields.Date.context_today(self)
-
-        for so in sale_orders:
-            project = so.project_id.display_name if hasattr(
-                so, "project_id") and so.project_id else ""
-            po_list = self._find_purchase_orders_for_so(so)
-            po_name = ", ".join(po_list.mapped("name")) if po_list else ""
-            vendor = ", ".join(sorted(
-                set(po_list.mapped("partner_id").mapped("display_name")))) if po_list else ""
-
-            containers = po_list.mapped("container_ids")
-            if not containers:
-                containers = po_list.mapped(
-                    "picking_ids").mapped("container_id")
-
-            invoices = self._get_out_invoices_for_so(so)
-
-            # If there are invoices, group rows by invoice so Milagros/SqFt appear once per invoice.
-            # If not, print rows without invoice grouping.
-            if invoices:
-                for inv in invoices:
-                    # Lines: 1 row per product_summary_line in each related container
-                    lines_to_print = []
-                    for c in containers:
-                        for pl in c.product_summary_line_ids:
-                            lines_to_print.append((c, pl))
-
-                    if not lines_to_print:
-                        continue
-
-                    group_start_row = row
-                    sqft_sum = 0.0
-
-                    for (container, pline) in lines_to_print:
-                        material = pline.product_id.display_name
-                        qty = pline.qty_ordered or 0.0
-                        uom = pline.uom_id.name if pline.uom_id else ""
-                        sqft_sum += qty
-
-                        ws.write_datetime(
-                            row, 0, fields.Date.to_date(today), date_fmt)
-                        ws.write(row, 1, project, text_fmt)
-                        ws.write(row, 2, so.name or "", text_fmt)
-                        ws.write(row, 3, po_name, text_fmt)
-                        ws.write(row, 4, self._state_label(
-                            container), text_fmt)
-                        ws.write(row, 5, container.name or "", text_fmt)
-                        # "Invoice" column: numeric reference like sample file (we use invoice id).
-                        ws.write(row, 6, inv.id, text_fmt)
-                        ws.write(row, 7, vendor, text_fmt)
-                        ws.write(row, 8, material, text_fmt)
-                        ws.write_number(row, 9, qty, num_fmt)
-                        ws.write(row, 10, uom, text_fmt)
-                        ws.write(row, 11, "", text_fmt)
-                        ws.write(row, 12, "", text_fmt)
-
-                        if row == group_start_row:
-                            ws.write(row, 13, inv.name or "", text_fmt)
-                            # overwritten after loop
-                            ws.write_number(row, 14, sqft_sum, num_fmt)
-                        else:
-                            ws.write(row, 13, "", text_fmt)
-                            ws.write(row, 14, "", text_fmt)
-
-                        ws.write(row, 15, "", text_fmt)  # Pablo
-                        ws.write(row, 16, "", text_fmt)  # Odoo
-                        row += 1
-
-                    ws.write_number(group_start_row, 14, sqft_sum, num_fmt)
-            else:
-                for container in containers:
-                    for pline in container.product_summary_line_ids:
-                        material = pline.product_id.display_name
-                        qty = pline.qty_ordered or 0.0
-                        uom = pline.uom_id.name if pline.uom_id else ""
-
-                        ws.write_datetime(
-                            row, 0, fields.Date.to_date(today), date_fmt)
-                        ws.write(row, 1, project, text_fmt)
-                        ws.write(row, 2, so.name or "", text_fmt)
-                        ws.write(row, 3, po_name, text_fmt)
-                        ws.write(row, 4, self._state_label(
-                            container), text_fmt)
-                        ws.write(row, 5, container.name or "", text_fmt)
-                        ws.write(row, 6, "", text_fmt)
-                        ws.write(row, 7, vendor, text_fmt)
-                        ws.write(row, 8, material, text_fmt)
-                        ws.write_number(row, 9, qty, num_fmt)
-                        ws.write(row, 10, uom, text_fmt)
-                        ws.write(row, 11, "", text_fmt)
-                        ws.write(row, 12, "", text_fmt)
-                        ws.write(row, 13, "", text_fmt)
-                        ws.write(row, 14, "", text_fmt)
-                        ws.write(row, 15, "", text_fmt)
-                        ws.write(row, 16, "", text_fmt)
-                        row += 1
-
-        wb.close()
-        output.seek(0)
-
-        filename = "reporte_contenedores_%s_%s.xlsx" % (
-            self.date_from, self.date_to)
-
-        # IMPORTANT: fields.Binary must be base64-encoded
-        xlsx_bytes = output.read()
-        self.write({
-            "file_name": filename,
-            "file_data": base64.b64encode(xlsx_bytes),
-        })
+    def _write_summary_xlsx(self, output):
+        """Write a workbook holding only the summary sheet into ``output``."""
+        wb = xlsxwriter.Workbook(output, {"constant_memory": True})
+        header_fmt, text_fmt, num_fmt, _date_fmt = self._add_xlsx_formats(wb)
+        self._write_summary_sheet(wb, header_fmt, text_fmt, num_fmt)
+        with self._report_stage("encode"):
+            wb.close()
+
+    def _get_sheet_name(self, part, used):
+        """Return a valid, unique (within ``used``) worksheet name for ``part``."""
+        name = re.sub(r"[\[\]:*?/\\]", "_", self._get_part_label(part))[:31]
+        candidate, suffix = name, 1
+        while candidate.lower() in used:
+            suffix += 1
+            candidate = "%s~%d" % (name[:31 - len(str(suffix)) - 1], suffix)
+        used.add(candidate.lower())
+        return candidate
+
+    def _write_summary_sheet(self, wb, header_fmt, text_fmt, num_fmt):
+        """Add the "Summary" sheet: one block of SqFt totals per
+        :data:`SUMMARY_SECTIONS` entry, each aggregated by the database."""
+        Line = self.env["purchase.container.report.line"]
+        ws = wb.add_worksheet("Summary")
+        ws.set_column(0, 3, 20)
+        date_from = fields.Datetime.to_datetime(self.date_from)
+        date_to = fields.Datetime.to_datetime(self.date_to)
+        with self._report_stage("summary"):
+            row = 0
+            for title, group_fields, headers in SUMMARY_SECTIONS:
+                ws.write(row, 0, title, header_fmt)
+                row += 1
+                ws.write_row(row, 0, headers + ["Lines", "SqFt"], header_fmt)
+                row += 1
+                for group in Line._read_range_totals(date_from, date_to, group_fields):
+                    ws.write_row(row, 0, [group[f] or "" for f in group_fields], text_fmt)
+                    ws.write(row, len(group_fields), group["__count"], text_fmt)
+                    ws.write(row, len(group_fields) + 1, group["qty"], num_fmt)
+                    row += 1
+                row += 1
+
+    def action_generate_excel(self):
+        self.ensure_one()
+        if self.date_from > self.date_to:
+            raise UserError(_("Date From must be before Date To."))
+
+        if self._estimate_sale_order_count() > self._get_async_threshold():
+            return self._queue_report_job()
+
+        if self.stream_download:
+            return {
+                "type": "ir.actions.act_url",
+                "url": "/purchase_container_report_xlsx/download/%s" % self.id,
+                "target": "self",
+            }
 
+        entry = self._get_report_cache()
         return {
             "type": "ir.actions.act_url",
-            "url": "/web/content/?model=%s&id=%s&field=file_data&filename_field=file_name&download=true" % (self._name, self.id),
+            "url": "/web/content/%s?download=true" % entry.attachment_id.id,
             "target": "self",
         }
@@ -1,5 +1,6 @@
 # Copyright 2025 Binhex - Antonio Ruban
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
+from . import controllers
 from . import models
 from . import wizard
@@ -1,7 +1,7 @@
 {
     "name": "Stock Barcodes Delivery Proof",
     "summary": "Capture delivery proof photos via barcode scanner per move line",
-    "version": "16.0.6.4.0",
+    "version": "16.0.11.0.0",
     "author": "Binhex, Odoo Community Association (OCA)",
     "website": "https://github.com/OCA/stock-logistics-barcode",
     "license": "AGPL-3",
@@ -9,6 +9,7 @@
     "depends": ["stock_barcodes"],
     "data": [
         "security/ir.model.access.csv",
+        "security/stock_delivery_proof_upload_security.xml",
         "views/res_config_settings_views.xml",
         "views/stock_barcodes_read_picking_views.xml",
         "views/stock_delivery_proof_image_views.xml",
@@ -24,6 +25,8 @@
         "web.assets_backend": [
             "stock_barcodes_delivery_proof/static/src/components/**/*",
             "stock_barcodes_delivery_proof/static/src/actions/**/*.esm.js",
+            "stock_barcodes_delivery_proof/static/src/utils/**/*.esm.js",
+            "stock_barcodes_delivery_proof/static/src/views/**/*.esm.js",
             "stock_barcodes_delivery_proof/static/src/scss/**/*.scss",
         ],
     },
@@ -0,0 +1,4 @@
+# Copyright 2025 Binhex - Antonio Ruban
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+from . import main
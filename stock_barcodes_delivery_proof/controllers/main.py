@@ -0,0 +1,39 @@
+# Copyright 2025 Binhex - Antonio Ruban
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+from werkzeug.exceptions import BadRequest, NotFound
+
+from odoo import http
+from odoo.exceptions import MissingError
+from odoo.http import request
+
+
+class DeliveryProofUploadController(http.Controller):
+    """Chunked upload of delivery proof photos.
+
+    The client starts (or resumes) an upload with the size and SHA-1 of the
+    photo, then posts the binary chunks from the returned offset. The
+    completed upload is attached to move lines or a picking through
+    ``stock.picking.action_attach_delivery_upload``.
+    """
+
+    @http.route("/stock_barcodes_delivery_proof/upload", type="json", auth="user")
+    def upload_start(self, size, checksum):
+        return request.env["stock.delivery.proof.upload"]._start(int(size), checksum)
+
+    @http.route(
+        "/stock_barcodes_delivery_proof/upload/<string:token>",
+        type="http",
+        auth="user",
+        methods=["POST"],
+    )
+    def upload_chunk(self, token, offset, chunk, **kwargs):
+        try:
+            upload = request.env["stock.delivery.proof.upload"]._get_by_token(token)
+        except MissingError as error:
+            raise NotFound() from error
+        try:
+            offset = int(offset)
+        except ValueError as error:
+            raise BadRequest() from error
+        return request.make_json_response(upload._write_chunk(offset, chunk.read()))
@@ -0,0 +1,68 @@
+# Copyright 2025 Binhex - Antonio Ruban
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+import logging
+
+from odoo import SUPERUSER_ID, api
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+
+
+def migrate(cr, version):
+    """Generate the resized copies and the MIME type of existing photos.
+
+    The ORM computes them when the fields are added, but on upgrades from
+    before 16.0.7.0.0 that happens before the photos are moved to the
+    filestore, so they come out empty; and the move writes the attachments
+    directly, which does not trigger their recomputation.
+
+    Photos are processed in batches, each committed on its own, so an
+    interrupted upgrade resumes where it stopped. Photos that can not be
+    decoded are logged and left without copies.
+    """
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    Photo = env["stock.delivery.proof.image"]
+    fields_to_compute = [
+        Photo._fields[name]
+        for name in ("image_mimetype", "image_1024", "image_512", "image_128")
+    ]
+    last_id = 0
+    done = 0
+    while True:
+        cr.execute(
+            """
+            SELECT id
+              FROM stock_delivery_proof_image
+             WHERE image_mimetype IS NULL
+               AND id > %s
+          ORDER BY id
+             LIMIT %s
+            """,
+            [last_id, BATCH_SIZE],
+        )
+        photo_ids = [photo_id for (photo_id,) in cr.fetchall()]
+        if not photo_ids:
+            break
+        last_id = photo_ids[-1]
+        for photo in Photo.browse(photo_ids):
+            try:
+                with cr.savepoint():
+                    for field in fields_to_compute:
+                        env.add_to_compute(field, photo)
+                    photo._set_image_attachment_mimetypes()
+            except UserError:
+                for field in fields_to_compute:
+                    env.remove_to_compute(field, photo)
+                env.invalidate_all(flush=False)
+                _logger.warning(
+                    "Delivery proof photo %s could not be decoded, its resized "
+                    "copies were not generated",
+                    photo.id,
+                )
+        cr.commit()
+        env.invalidate_all()
+        done += len(photo_ids)
+        _logger.info("Generated the resized copies of %s delivery proof photos", done)
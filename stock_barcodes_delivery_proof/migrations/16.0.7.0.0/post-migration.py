@@ -0,0 +1,70 @@
+# Copyright 2025 Binhex - Antonio Ruban
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+import logging
+
+from odoo import SUPERUSER_ID, api
+
+_logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+
+
+def migrate(cr, version):
+    """Move the photos of the former ``image`` bytea column to attachments.
+
+    Rows are moved in batches, each committed on its own: every batch only
+    locks the rows it moves, and an interrupted upgrade resumes where it
+    stopped. The filestore is content-addressed, so identical photos end up
+    in a single file. The emptied column is dropped at the end.
+    """
+    cr.execute(
+        """
+        SELECT 1
+          FROM information_schema.columns
+         WHERE table_name = 'stock_delivery_proof_image'
+           AND column_name = 'image'
+        """
+    )
+    if not cr.fetchone():
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    Attachment = env["ir.attachment"]
+    moved = 0
+    while True:
+        cr.execute(
+            """
+            SELECT id, image
+              FROM stock_delivery_proof_image
+             WHERE image IS NOT NULL
+          ORDER BY id
+             LIMIT %s
+            """,
+            [BATCH_SIZE],
+        )
+        rows = cr.fetchall()
+        if not rows:
+            break
+        # The column held the base64 encoded photo.
+        Attachment.create(
+            [
+                {
+                    "name": "image",
+                    "res_model": "stock.delivery.proof.image",
+                    "res_field": "image",
+                    "res_id": photo_id,
+                    "type": "binary",
+                    "datas": bytes(image),
+                }
+                for photo_id, image in rows
+            ]
+        )
+        cr.execute(
+            "UPDATE stock_delivery_proof_image SET image = NULL WHERE id IN %s",
+            [tuple(photo_id for photo_id, _image in rows)],
+        )
+        cr.commit()
+        env.invalidate_all()
+        moved += len(rows)
+        _logger.info("Moved %s delivery proof photos to the filestore", moved)
+    cr.execute("ALTER TABLE stock_delivery_proof_image DROP COLUMN image")
@@ -0,0 +1,81 @@
+# Copyright 2025 Binhex - Antonio Ruban
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Link photos to their move lines through the many2many relation.
+
+    The former ``move_line_id`` column is copied into the relation. Photos
+    that were saved once per move line of a todo (same author, same
+    transaction and same content) are then merged into the oldest one,
+    which takes over the lines of the others. The column is dropped at the
+    end.
+    """
+    cr.execute(
+        """
+        SELECT 1
+          FROM information_schema.columns
+         WHERE table_name = 'stock_delivery_proof_image'
+           AND column_name = 'move_line_id'
+        """
+    )
+    if not cr.fetchone():
+        return
+    cr.execute(
+        """
+        INSERT INTO stock_delivery_proof_image_move_line_rel (image_id, move_line_id)
+        SELECT id, move_line_id
+          FROM stock_delivery_proof_image
+         WHERE move_line_id IS NOT NULL
+        ON CONFLICT DO NOTHING
+        """
+    )
+    cr.execute(
+        """
+        SELECT array_agg(img.id ORDER BY img.id)
+          FROM stock_delivery_proof_image img
+          JOIN ir_attachment att
+            ON att.res_model = 'stock.delivery.proof.image'
+           AND att.res_field = 'image'
+           AND att.res_id = img.id
+         WHERE img.move_line_id IS NOT NULL
+      GROUP BY img.create_uid, img.create_date, att.checksum
+        HAVING count(*) > 1
+        """
+    )
+    merged = 0
+    for (photo_ids,) in cr.fetchall():
+        keep_id, duplicate_ids = photo_ids[0], tuple(photo_ids[1:])
+        cr.execute(
+            """
+            INSERT INTO stock_delivery_proof_image_move_line_rel (image_id, move_line_id)
+            SELECT %s, move_line_id
+              FROM stock_delivery_proof_image_move_line_rel
+             WHERE image_id IN %s
+            ON CONFLICT DO NOTHING
+            """,
+            [keep_id, duplicate_ids],
+        )
+        # The files themselves are shared, the garbage collector of the
+        # filestore removes them once no attachment points to them.
+        cr.execute(
+            """
+            DELETE FROM ir_attachment
+             WHERE res_model = 'stock.delivery.proof.image'
+               AND res_field = 'image'
+               AND res_id IN %s
+            """,
+            [duplicate_ids],
+        )
+        cr.execute(
+            "DELETE FROM stock_delivery_proof_image WHERE id IN %s",
+            [duplicate_ids],
+        )
+        merged += len(duplicate_ids)
+    if merged:
+        _logger.info("Merged %s duplicated delivery proof photos", merged)
+    cr.execute("ALTER TABLE stock_delivery_proof_image DROP COLUMN move_line_id")
@@ -3,3 +3,4 @@ from . import res_config_settings
 from . import stock_delivery_proof_image
 from . import stock_move_line
 from . import stock_picking
+from . import stock_delivery_proof_upload
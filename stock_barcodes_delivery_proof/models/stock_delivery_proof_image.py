@@ -1,8 +1,32 @@
 # Copyright 2025 Binhex - Antonio Ruban
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
+import base64
+import io
+
+from PIL import Image
+
 from odoo import _, api, fields, models
-from odoo.exceptions import ValidationError
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools.image import EXIF_TAG_ORIENTATION, image_fix_orientation
+
+try:
+    # Registers AVIF in Pillow versions without native support
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pillow_avif = None
+
+# Formats the camera may encode photos in, most compact first
+IMAGE_FORMATS = {
+    "image/avif": "AVIF",
+    "image/webp": "WEBP",
+    "image/jpeg": "JPEG",
+}
+IMAGE_VARIANT_SIZES = {
+    "image_1024": 1024,
+    "image_512": 512,
+    "image_128": 128,
+}
 
 
 class StockDeliveryProofImage(models.Model):
@@ -10,12 +34,20 @@ class StockDeliveryProofImage(models.Model):
     _description = "Delivery Proof Image"
     _order = "create_date desc"
 
+    move_line_ids = fields.Many2many(
+        comodel_name="stock.move.line",
+        relation="stock_delivery_proof_image_move_line_rel",
+        column1="image_id",
+        column2="move_line_id",
+        string="Move Lines",
+        help="Move lines proven by this photo (for per-line mode)",
+    )
     move_line_id = fields.Many2one(
         comodel_name="stock.move.line",
-        required=False,
-        ondelete="cascade",
-        index=True,
-        help="Link to move line (for per-line mode)",
+        compute="_compute_move_line_id",
+        inverse="_inverse_move_line_id",
+        search="_search_move_line_id",
+        help="First move line proven by this photo (for per-line mode)",
     )
     picking_id = fields.Many2one(
         comodel_name="stock.picking",
@@ -24,10 +56,28 @@ class StockDeliveryProofImage(models.Model):
         index=True,
         help="Link to picking (for per-picking mode)",
     )
+    # A plain binary: the Image field would turn AVIF photos into JPEG
     image = fields.Binary(
         string="Photo",
         required=True,
-        attachment=False,  # Store directly in DB, not as ir.attachment
+        # Stored in the filestore, where identical photos share one file
+        attachment=True,
+    )
+    image_mimetype = fields.Char(
+        compute="_compute_image_variants",
+        store=True,
+        string="Photo Type",
+    )
+    # Resized copies generated on save, so views only download what they
+    # display; the original is only served when downloaded.
+    image_1024 = fields.Image(
+        string="Photo 1024", compute="_compute_image_variants", store=True
+    )
+    image_512 = fields.Image(
+        string="Photo 512", compute="_compute_image_variants", store=True
+    )
+    image_128 = fields.Image(
+        string="Photo 128", compute="_compute_image_variants", store=True
     )
     capture_date = fields.Datetime(
         default=fields.Datetime.now,
@@ -40,12 +90,128 @@ class StockDeliveryProofImage(models.Model):
         required=True,
     )
     notes = fields.Text()
+    client_key = fields.Char(
+        copy=False,
+        readonly=True,
+        help="Key sent by the client with the photo, so replayed uploads "
+        "do not create it twice",
+    )
+
+    _sql_constraints = [
+        (
+            "client_key_unique",
+            "unique(client_key)",
+            "A photo with this client key already exists.",
+        ),
+    ]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._set_image_attachment_mimetypes()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "image" in vals:
+            self._set_image_attachment_mimetypes()
+        return res
+
+    @api.depends("image")
+    def _compute_image_variants(self):
+        """Resize the photo in its own format, so a WebP or AVIF photo keeps
+        its smaller size in all its copies."""
+        for record in self:
+            values = dict.fromkeys(["image_mimetype", *IMAGE_VARIANT_SIZES], False)
+            if record.image:
+                data = base64.b64decode(record.image)
+                try:
+                    image = Image.open(io.BytesIO(data))
+                    image.load()
+                except (OSError, ValueError) as error:
+                    raise UserError(
+                        _("This file could not be decoded as an image file.")
+                    ) from error
+                values["image_mimetype"] = Image.MIME.get(self._get_image_format(image))
+                for field, size in IMAGE_VARIANT_SIZES.items():
+                    values[field] = record._resize_image(image, size) or record.image
+            record.update(values)
 
-    @api.constrains("move_line_id", "picking_id")
+    @api.model
+    def _resize_image(self, image, size):
+        """Return ``image`` upright and fitted in a ``size`` pixels square,
+        encoded in base64 in its format, or None if it is already upright
+        and fits, or its format can not be written."""
+        image_format = self._get_image_format(image)
+        if image_format not in Image.SAVE:
+            return None
+        upright = image.getexif().get(EXIF_TAG_ORIENTATION, 1) == 1
+        if upright and max(image.size) <= size:
+            return None
+        # The copies are encoded without EXIF data, so the rotation is applied
+        # even when the photo is not resized.
+        resized = image_fix_orientation(image.copy())
+        resized.thumbnail((size, size), Image.LANCZOS)
+        output = io.BytesIO()
+        resized.save(output, format=image_format, quality=80)
+        return base64.b64encode(output.getvalue())
+
+    @api.model
+    def _get_image_format(self, image):
+        # Pillow reads the JPEG of some cameras as multi-picture files
+        return "JPEG" if image.format == "MPO" else image.format
+
+    def _set_image_attachment_mimetypes(self):
+        """Store the MIME type of the photos on their attachments, from which
+        they are served: it is not always guessed from the content (AVIF)."""
+        fields_names = ["image", *IMAGE_VARIANT_SIZES]
+        self.flush_recordset(fields_names + ["image_mimetype"])
+        attachments = (
+            self.env["ir.attachment"]
+            .sudo()
+            .search(
+                [
+                    ("res_model", "=", self._name),
+                    ("res_field", "in", fields_names),
+                    ("res_id", "in", self.ids),
+                ]
+            )
+        )
+        mimetypes = dict(zip(self.ids, self.mapped("image_mimetype")))
+        for attachment in attachments:
+            mimetype = mimetypes[attachment.res_id]
+            if mimetype and attachment.mimetype != mimetype:
+                attachment.mimetype = mimetype
+
+    @api.model
+    def get_supported_image_formats(self):
+        """Return the MIME types of the camera formats this server can read
+        and resize, most compact first."""
+        Image.init()
+        return [
+            mimetype
+            for mimetype, image_format in IMAGE_FORMATS.items()
+            if image_format in Image.OPEN and image_format in Image.SAVE
+        ]
+
+    @api.depends("move_line_ids")
+    def _compute_move_line_id(self):
+        for record in self:
+            record.move_line_id = record.move_line_ids[:1]
+
+    def _inverse_move_line_id(self):
+        for record in self:
+            record.move_line_ids = record.move_line_id
+
+    def _search_move_line_id(self, operator, value):
+        """A photo matches every move line it proves, not only the first."""
+        return [("move_line_ids", operator, value)]
+
+    @api.constrains("move_line_ids", "picking_id")
     def _check_move_line_or_picking(self):
         """Ensure at least one reference is provided."""
         for record in self:
-            if not record.move_line_id and not record.picking_id:
+            if not record.move_line_ids and not record.picking_id:
                 raise ValidationError(
                     _("Photo must be linked to either a move line or a picking.")
                 )
@@ -67,6 +233,52 @@ class StockDeliveryProofImage(models.Model):
             result.append((record.id, name))
         return result
 
+    def _get_image_urls(self):
+        """Return the URLs of the photo and of its resized copies.
+
+        The ``unique`` parameter changes whenever the photo is written, so
+        browsers may keep the responses in their cache for good.
+        """
+        self.ensure_one()
+        unique = self.write_date.strftime("%Y%m%d%H%M%S")
+        urls = {
+            field: f"/web/image/{self._name}/{self.id}/{field}?unique={unique}"
+            for field in ("image_128", "image_512", "image_1024")
+        }
+        urls["download"] = (
+            f"/web/content/{self._name}/{self.id}/image"
+            f"?download=true&unique={unique}"
+        )
+        return urls
+
+    @api.model
+    def get_gallery_data(self, move_line_id=None, picking_id=None):
+        """Return the photos of a picking or move line, newest first.
+
+        Only metadata is returned: each photo comes with the URLs of its
+        copies, which the browser loads lazily and caches.
+
+        Args:
+            move_line_id (int): ID of the stock.move.line (per-line mode)
+            picking_id (int): ID of the stock.picking (per-picking mode)
+
+        Returns:
+            list: photo dicts with metadata and ``urls``
+        """
+        if picking_id:
+            domain = [("picking_id", "=", picking_id)]
+        elif move_line_id:
+            domain = [("move_line_id", "=", move_line_id)]
+        else:
+            return []
+        photos = self.search(domain, order="capture_date desc")
+        result = photos.read(
+            ["capture_date", "captured_by_id", "move_line_id", "picking_id"]
+        )
+        for photo, values in zip(photos, result):
+            values["urls"] = photo._get_image_urls()
+        return result
+
     def action_download_image(self):
         """Download the delivery proof image as attachment."""
         self.ensure_one()
@@ -0,0 +1,171 @@
+# Copyright 2025 Binhex - Antonio Ruban
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+import hashlib
+import logging
+import os
+import uuid
+from datetime import timedelta
+
+from odoo import _, api, fields, models
+from odoo.exceptions import MissingError, UserError
+from odoo.tools import config
+
+_logger = logging.getLogger(__name__)
+
+
+class StockDeliveryProofUpload(models.Model):
+    """A photo being uploaded in chunks.
+
+    The chunks are appended to a file of the filestore until the whole photo
+    is received and its checksum verified. A dropped connection only loses
+    the chunk in flight: starting the upload of the same photo again resumes
+    it where it stopped.
+    """
+
+    _name = "stock.delivery.proof.upload"
+    _description = "Delivery Proof Photo Upload"
+
+    MAX_SIZE = 20 * 1024 * 1024
+
+    token = fields.Char(
+        required=True,
+        readonly=True,
+        copy=False,
+        default=lambda self: uuid.uuid4().hex,
+    )
+    user_id = fields.Many2one(
+        comodel_name="res.users",
+        required=True,
+        readonly=True,
+        default=lambda self: self.env.user,
+        ondelete="cascade",
+    )
+    size = fields.Integer(required=True, readonly=True)
+    checksum = fields.Char(
+        required=True, readonly=True, help="SHA-1 of the whole photo"
+    )
+    received_size = fields.Integer(readonly=True)
+    state = fields.Selection(
+        selection=[("open", "Open"), ("done", "Done")],
+        default="open",
+        required=True,
+        readonly=True,
+    )
+
+    _sql_constraints = [
+        ("token_unique", "unique(token)", "The upload token must be unique."),
+    ]
+
+    def _get_path(self):
+        self.ensure_one()
+        path = os.path.join(
+            config.filestore(self.env.cr.dbname), "delivery_proof_uploads"
+        )
+        os.makedirs(path, exist_ok=True)
+        return os.path.join(path, self.token)
+
+    def _get_status(self):
+        self.ensure_one()
+        return {
+            "token": self.token,
+            "offset": self.received_size,
+            "done": self.state == "done",
+            "checksum_ok": True,
+        }
+
+    @api.model
+    def _start(self, size, checksum):
+        """Start the upload of a photo, or resume the unfinished upload of
+        the same photo by the current user.
+
+        Returns:
+            dict: the upload status, with the offset to send next
+        """
+        if not 0 < size <= self.MAX_SIZE:
+            raise UserError(
+                _("Photos must be smaller than %s MB.") % (self.MAX_SIZE // 2**20)
+            )
+        upload = self.search(
+            [
+                ("user_id", "=", self.env.uid),
+                ("size", "=", size),
+                ("checksum", "=", checksum.lower()),
+            ],
+            limit=1,
+        )
+        if not upload:
+            upload = self.create({"size": size, "checksum": checksum.lower()})
+        return upload._get_status()
+
+    @api.model
+    def _get_by_token(self, token):
+        upload = self.search(
+            [("token", "=", token), ("user_id", "=", self.env.uid)], limit=1
+        )
+        if not upload:
+            raise MissingError(_("This upload does not exist anymore."))
+        return upload
+
+    def _write_chunk(self, offset, data):
+        """Write ``data`` at ``offset`` of the photo.
+
+        A chunk that does not start at or before the received size is
+        ignored, the client resends from the returned offset. Once the last
+        chunk is written, the checksum is verified: on mismatch, the upload
+        starts over.
+
+        Returns:
+            dict: the upload status
+        """
+        self.ensure_one()
+        # Serialize the chunks of an upload
+        self.env.cr.execute(
+            "SELECT id FROM stock_delivery_proof_upload WHERE id = %s FOR UPDATE",
+            [self.id],
+        )
+        self.invalidate_recordset(["received_size", "state"])
+        if self.state == "done" or not 0 <= offset <= self.received_size:
+            return self._get_status()
+        end = offset + len(data)
+        if end > self.size:
+            raise UserError(_("The uploaded data exceeds the photo size."))
+        mode = "r+b" if offset else "wb"
+        with open(self._get_path(), mode) as file:
+            file.seek(offset)
+            file.write(data)
+            file.truncate()
+        self.received_size = end
+        if end < self.size:
+            return self._get_status()
+        if hashlib.sha1(self._read()).hexdigest() != self.checksum:
+            _logger.warning("Checksum mismatch of delivery proof upload %s", self.id)
+            self.received_size = 0
+            return dict(self._get_status(), checksum_ok=False)
+        self.state = "done"
+        return self._get_status()
+
+    def _read(self):
+        self.ensure_one()
+        with open(self._get_path(), "rb") as file:
+            return file.read()
+
+    def unlink(self):
+        paths = [upload._get_path() for upload in self]
+
+        # Keep the files if the transaction is rolled back
+        @self.env.cr.postcommit.add
+        def remove_files():
+            for path in paths:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+
+        return super().unlink()
+
+    @api.autovacuum
+    def _gc_stale_uploads(self):
+        """Drop the uploads left unfinished or unattached for a day."""
+        limit = fields.Datetime.now() - timedelta(days=1)
+        self.sudo().search([("write_date", "<", limit)]).unlink()
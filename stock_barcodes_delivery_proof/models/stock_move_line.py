@@ -7,9 +7,11 @@ from odoo import api, fields, models
 class StockMoveLine(models.Model):
     _inherit = "stock.move.line"
 
-    delivery_proof_image_ids = fields.One2many(
+    delivery_proof_image_ids = fields.Many2many(
         comodel_name="stock.delivery.proof.image",
-        inverse_name="move_line_id",
+        relation="stock_delivery_proof_image_move_line_rel",
+        column1="move_line_id",
+        column2="image_id",
         string="Delivery Proof Photos",
     )
     delivery_proof_count = fields.Integer(
@@ -30,6 +32,15 @@ class StockMoveLine(models.Model):
             line.delivery_proof_count = count
             line.has_delivery_proof = count > 0
 
+    def unlink(self):
+        """Delete the per-line photos left without any move line."""
+        images = self.delivery_proof_image_ids
+        res = super().unlink()
+        images.exists().filtered(
+            lambda image: not image.move_line_ids and not image.picking_id
+        ).unlink()
+        return res
+
     def action_open_line_photos(self):
         """Open photo gallery for this move line."""
         self.ensure_one()
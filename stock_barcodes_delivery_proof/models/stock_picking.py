@@ -1,7 +1,9 @@
 # Copyright 2025 Binhex - Antonio Ruban
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
-from odoo import api, fields, models
+import base64
+
+from odoo import Command, api, fields, models
 
 
 class StockPicking(models.Model):
@@ -54,3 +56,121 @@ class StockPicking(models.Model):
                     lambda line: line.delivery_proof_count > 0
                 )
             )
+
+    def _get_delivery_photo_result(self, photo):
+        """Return the result of :meth:`_save_delivery_photo` for the saved
+        ``photo``."""
+        if photo.picking_id:
+            return {
+                "success": True,
+                "photo_ids": photo.ids,
+                "move_line_count": 0,
+                "message": "Photo saved to picking",
+                "mode": "picking",
+            }
+        line_count = len(photo.move_line_ids)
+        return {
+            "success": True,
+            "photo_ids": photo.ids,
+            "move_line_count": line_count,
+            "message": f"Photo saved to {line_count} move line(s)",
+            "mode": "move_line",
+        }
+
+    def _save_delivery_photo(self, image_data, move_line_ids=None, client_key=None):
+        """Save a delivery proof photo based on delivery_proof_level setting.
+
+        - If 'move_line': Creates one photo record shared by the move lines
+        - If 'picking': Creates single photo record at picking level
+
+        Args:
+            image_data (str): Base64 encoded image data
+            move_line_ids (list): IDs of the move lines of the picking proven
+                by the photo (ignored for picking)
+            client_key (str): Key of the photo on the client. A photo already
+                saved with this key is returned instead of being saved again.
+
+        Returns:
+            dict: {
+                'success': bool,
+                'photo_ids': list with the created photo ID,
+                'move_line_count': number of lines affected (0 for picking mode),
+                'message': success/error message
+            }
+        """
+        self.ensure_one()
+        Image = self.env["stock.delivery.proof.image"]
+
+        if client_key:
+            photo = Image.search([("client_key", "=", client_key)], limit=1)
+            if photo:
+                return self._get_delivery_photo_result(photo)
+
+        if self.company_id.delivery_proof_level == "picking":
+            photo = Image.create(
+                {
+                    "picking_id": self.id,
+                    "image": image_data,
+                    "client_key": client_key,
+                }
+            )
+            return self._get_delivery_photo_result(photo)
+
+        lines = self.move_line_ids.filtered(
+            lambda line: line.id in set(move_line_ids or [])
+        )
+        if not lines:
+            return {
+                "success": False,
+                "message": "No move lines found for this photo",
+                "photo_ids": [],
+                "move_line_count": 0,
+            }
+        # One photo, stored once, proves all the move lines
+        photo = Image.create(
+            {
+                "move_line_ids": [Command.set(lines.ids)],
+                "image": image_data,
+                "client_key": client_key,
+            }
+        )
+        return self._get_delivery_photo_result(photo)
+
+    def action_attach_delivery_upload(self, token, move_line_ids=None, client_key=None):
+        """Save a photo uploaded through the chunked upload controller.
+
+        Photos are queued on the device with the picking and move line IDs,
+        which, unlike the barcode wizard records, still exist when the queue
+        is replayed in a later session.
+
+        Args:
+            token (str): token of the completed upload
+            move_line_ids (list): IDs of the move lines proven by the photo
+                (ignored for picking)
+            client_key (str): Key of the photo on the client. Replaying the
+                call for a saved photo returns it, its upload being gone.
+
+        Returns:
+            dict: same as :meth:`_save_delivery_photo`
+        """
+        self.ensure_one()
+        if client_key:
+            photo = self.env["stock.delivery.proof.image"].search(
+                [("client_key", "=", client_key)], limit=1
+            )
+            if photo:
+                return self._get_delivery_photo_result(photo)
+        upload = self.env["stock.delivery.proof.upload"]._get_by_token(token)
+        if upload.state != "done":
+            return {
+                "success": False,
+                "message": "Photo upload is not complete",
+                "photo_ids": [],
+                "move_line_count": 0,
+            }
+        result = self._save_delivery_photo(
+            base64.b64encode(upload._read()), move_line_ids, client_key=client_key
+        )
+        if result["success"]:
+            upload.unlink()
+        return result
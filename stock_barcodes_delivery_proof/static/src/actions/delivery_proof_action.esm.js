@@ -5,22 +5,48 @@ import {registry} from "@web/core/registry";
 
 /**
  * Client action to open photo gallery modal
+ *
+ * Resolves when the modal is closed. If photos were deleted, it resolves to
+ * a close action: the barcode wizard button that opened the modal then
+ * reloads the record in place, without reloading the page. Captured photos
+ * are uploaded in the background, the barcode form reloads the record
+ * when they are (see ``views/barcode_form_controller.esm.js``).
+ *
  * @param {Object} env - Odoo environment
  * @param {Object} action - Action parameters
  * @param {Object} action.params - Action parameters
  * @param {Number} action.params.todo_id - Todo ID (for move_line mode)
- * @param {Number} action.params.picking_id - Picking ID (for picking mode)
+ * @param {Number} action.params.picking_id - Picking ID
+ * @param {Number[]} action.params.move_line_ids - Move line IDs of the todo
+ *     (for move_line mode)
  * @param {Number} action.params.wizard_id - Wizard ID
  * @param {String} action.params.mode - Mode ('move_line' or 'picking')
+ * @returns {Promise<Object|undefined>}
  */
 function displayDeliveryProofModal(env, action) {
-    const {todo_id, picking_id, wizard_id, mode} = action.params;
+    const {todo_id, picking_id, move_line_ids, wizard_id, mode} = action.params;
 
-    env.services.dialog.add(PhotoGalleryModal, {
-        todoId: todo_id,
-        pickingId: picking_id,
-        wizardId: wizard_id,
-        mode: mode,
+    return new Promise((resolve) => {
+        let photosChanged = false;
+        env.services.dialog.add(
+            PhotoGalleryModal,
+            {
+                todoId: todo_id,
+                pickingId: picking_id,
+                moveLineIds: move_line_ids,
+                wizardId: wizard_id,
+                mode: mode,
+                onPhotosChanged: () => {
+                    photosChanged = true;
+                },
+            },
+            {
+                onClose: () =>
+                    resolve(
+                        photosChanged ? {type: "ir.actions.act_window_close"} : undefined
+                    ),
+            }
+        );
     });
 }
 
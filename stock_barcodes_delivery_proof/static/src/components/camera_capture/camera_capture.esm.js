@@ -1,8 +1,22 @@
 /** @odoo-module **/
 
-import {Component, onMounted, onWillUnmount, useRef, useState} from "@odoo/owl";
+import {
+    Component,
+    onMounted,
+    onWillStart,
+    onWillUnmount,
+    useRef,
+    useState,
+} from "@odoo/owl";
 import {useService} from "@web/core/utils/hooks";
 
+function canvasToBlob(canvas, mimetype, quality) {
+    return new Promise((resolve) => canvas.toBlob(resolve, mimetype, quality));
+}
+
+// Format negotiated once per page load, see CameraCapture._negotiateFormat
+let formatPromise = null;
+
 export class CameraCapture extends Component {
     static template = "stock_barcodes_delivery_proof.CameraCapture";
     static props = {
@@ -19,7 +33,19 @@ export class CameraCapture extends Component {
     // Image compression settings for handheld devices
     static MAX_WIDTH = 1280;
     static MAX_HEIGHT = 960;
-    static JPEG_QUALITY = 0.75;
+    // Longest side below which photos are not scaled down further
+    static MIN_SIZE = 640;
+    // Formats by order of preference: the first one supported by both the
+    // browser and the server is used
+    static FORMATS = ["image/avif", "image/webp", "image/jpeg"];
+    static QUALITIES = [0.8, 0.7, 0.6, 0.5, 0.4];
+    // Target size of a photo in bytes, by effective connection type
+    static BYTE_BUDGETS = {
+        "slow-2g": 40 * 1024,
+        "2g": 60 * 1024,
+        "3g": 120 * 1024,
+        "4g": 250 * 1024,
+    };
 
     setup() {
         // Back camera by default
@@ -34,10 +60,20 @@ export class CameraCapture extends Component {
         this.videoRef = useRef("video");
         this.canvasRef = useRef("canvas");
         this.stream = null;
+        this.previewUrl = null;
+        this.mimetype = "image/jpeg";
+        this.orm = useService("orm");
         this.notification = useService("notification");
 
+        onWillStart(async () => {
+            this.mimetype = await this._negotiateFormat();
+        });
+
         onMounted(() => this.startCamera());
-        onWillUnmount(() => this.stopCamera());
+        onWillUnmount(() => {
+            this.stopCamera();
+            this._revokePreviewUrl();
+        });
     }
 
     async startCamera() {
@@ -109,7 +145,111 @@ export class CameraCapture extends Component {
         return {width, height};
     }
 
-    capturePhoto() {
+    /**
+     * Return the most compact photo format both the browser can encode and
+     * the server can read, JPEG if the server can not be reached.
+     *
+     * @returns {Promise<String>} MIME type
+     */
+    _negotiateFormat() {
+        if (!formatPromise) {
+            formatPromise = this._getFormat().catch(() => {
+                // Try again next time, e.g. once back online
+                formatPromise = null;
+                return "image/jpeg";
+            });
+        }
+        return formatPromise;
+    }
+
+    async _getFormat() {
+        const serverFormats = await this.orm.call(
+            "stock.delivery.proof.image",
+            "get_supported_image_formats",
+            []
+        );
+        const canvas = document.createElement("canvas");
+        canvas.width = canvas.height = 1;
+        for (const mimetype of CameraCapture.FORMATS) {
+            if (!serverFormats.includes(mimetype)) {
+                continue;
+            }
+            // Browsers encode the formats they do not support as PNG
+            const blob = await canvasToBlob(canvas, mimetype);
+            if (blob && blob.type === mimetype) {
+                return mimetype;
+            }
+        }
+        return "image/jpeg";
+    }
+
+    _getByteBudget() {
+        const connection = navigator.connection;
+        if (connection && connection.saveData) {
+            return CameraCapture.BYTE_BUDGETS["2g"];
+        }
+        return (
+            (connection && CameraCapture.BYTE_BUDGETS[connection.effectiveType]) ||
+            CameraCapture.BYTE_BUDGETS["4g"]
+        );
+    }
+
+    /**
+     * Encode ``canvas`` in the negotiated format, falling back to JPEG when
+     * the browser fails to (``toBlob`` gives null, e.g. for a canvas too
+     * large for the encoder): that format is then treated as unsupported.
+     *
+     * @param {HTMLCanvasElement} canvas
+     * @param {Number} quality
+     * @returns {Promise<Blob>}
+     */
+    async _canvasToBlob(canvas, quality) {
+        for (;;) {
+            const blob = await canvasToBlob(canvas, this.mimetype, quality);
+            if (blob) {
+                return blob;
+            }
+            if (this.mimetype === "image/jpeg") {
+                throw new Error("The photo could not be encoded.");
+            }
+            console.warn(`Could not encode the photo as ${this.mimetype}, using JPEG`);
+            this.mimetype = "image/jpeg";
+        }
+    }
+
+    /**
+     * Encode the photo drawn on ``canvas`` within the byte budget of the
+     * current connection: the quality is lowered first, then the resolution.
+     *
+     * @param {HTMLCanvasElement} canvas
+     * @returns {Promise<Blob>}
+     */
+    async _encodePhoto(canvas) {
+        const budget = this._getByteBudget();
+        let source = canvas;
+        let blob = null;
+        for (;;) {
+            for (const quality of CameraCapture.QUALITIES) {
+                blob = await this._canvasToBlob(source, quality);
+                if (blob.size <= budget) {
+                    return blob;
+                }
+            }
+            const width = Math.round(source.width * 0.8);
+            const height = Math.round(source.height * 0.8);
+            if (Math.max(width, height) < CameraCapture.MIN_SIZE) {
+                // Smallest acceptable photo
+                return blob;
+            }
+            const scaled = document.createElement("canvas");
+            scaled.width = width;
+            scaled.height = height;
+            scaled.getContext("2d").drawImage(canvas, 0, 0, width, height);
+            source = scaled;
+        }
+    }
+
+    async capturePhoto() {
         const video = this.videoRef.el;
         const canvas = this.canvasRef.el;
 
@@ -129,13 +269,22 @@ export class CameraCapture extends Component {
         canvas.height = height;
         context.drawImage(video, 0, 0, width, height);
 
-        // Compress to JPEG with reduced quality for handheld devices
-        const imageData = canvas
-            .toDataURL("image/jpeg", CameraCapture.JPEG_QUALITY)
-            .split(",")[1];
+        // Compress for handheld devices, as binary data: it is uploaded as is
+        let blob = null;
+        try {
+            blob = await this._encodePhoto(canvas);
+        } catch (error) {
+            console.error("Photo encoding error:", error);
+            this.notification.add("Could not save the photo. Please try again.", {
+                type: "danger",
+            });
+            return;
+        }
 
         // Show preview
-        this.state.capturedImage = imageData;
+        this._revokePreviewUrl();
+        this.state.capturedImage = blob;
+        this.previewUrl = URL.createObjectURL(blob);
         this.state.showPreview = true;
 
         // Pause video
@@ -145,6 +294,7 @@ export class CameraCapture extends Component {
     retakePhoto() {
         this.state.showPreview = false;
         this.state.capturedImage = null;
+        this._revokePreviewUrl();
         this.startCamera();
     }
 
@@ -161,9 +311,13 @@ export class CameraCapture extends Component {
     }
 
     getPreviewUrl() {
-        if (this.state.capturedImage) {
-            return `data:image/jpeg;base64,${this.state.capturedImage}`;
+        return this.previewUrl || "";
+    }
+
+    _revokePreviewUrl() {
+        if (this.previewUrl) {
+            URL.revokeObjectURL(this.previewUrl);
+            this.previewUrl = null;
         }
-        return "";
     }
 }
@@ -29,35 +29,17 @@ export class DeliveryProofGallery extends Component {
     }
 
     async loadImages() {
-        let domain = [];
-
-        // Determine domain based on props - both modes use same model now
-        if (this.props.pickingId) {
-            // Picking-level photos
-            domain = [["picking_id", "=", this.props.pickingId]];
-        } else if (this.props.moveLineId) {
-            // Move line-level photos
-            domain = [["move_line_id", "=", this.props.moveLineId]];
-        } else {
-            // Fallback: no filter
-            this.state.loading = false;
-            return;
-        }
-
-        // All photos use the unified model with same fields
-        const model = "stock.delivery.proof.image";
-        const fields = [
-            "id",
-            "image",
-            "capture_date",
-            "captured_by_id",
-            "move_line_id",
-            "picking_id",
-        ];
-
-        const images = await this.orm.searchRead(model, domain, fields, {
-            order: "capture_date desc",
-        });
+        // Metadata only: images are loaded from their URL, in the size they
+        // are shown in, and cached by the browser.
+        const images = await this.orm.call(
+            "stock.delivery.proof.image",
+            "get_gallery_data",
+            [],
+            {
+                move_line_id: this.props.moveLineId || false,
+                picking_id: this.props.pickingId || false,
+            }
+        );
 
         this.state.images = images;
 
@@ -75,11 +57,11 @@ export class DeliveryProofGallery extends Component {
         return this.state.images.length > 1;
     }
 
-    getImageUrl(image) {
-        if (!image || !image.image) {
+    getImageUrl(image, field = "image_1024") {
+        if (!image) {
             return "";
         }
-        return `data:image/jpeg;base64,${image.image}`;
+        return image.urls[field];
     }
 
     next() {
@@ -114,7 +96,6 @@ export class DeliveryProofGallery extends Component {
             return;
         }
         // Trigger browser download using Odoo's web/content endpoint
-        const url = `/web/content/stock.delivery.proof.image/${image.id}/image?download=true`;
-        window.location.href = url;
+        window.location.href = image.urls.download;
     }
 }
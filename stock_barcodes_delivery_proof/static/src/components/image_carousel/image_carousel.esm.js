@@ -67,7 +67,8 @@ export class ImageCarousel extends Component {
 
     getImageUrl(image) {
         if (!image) return "";
-        return `/web/image/stock.delivery.proof.image/${image.id}/image`;
+        // Largest resized copy; the original is only fetched for download
+        return image.urls.image_1024;
     }
 
     formatDate(dateString) {
@@ -4,31 +4,39 @@ import {Component, onWillStart, useState} from "@odoo/owl";
 import {CameraCapture} from "@stock_barcodes_delivery_proof/components/camera_capture/camera_capture.esm";
 import {Dialog} from "@web/core/dialog/dialog";
 import {ImageCarousel} from "@stock_barcodes_delivery_proof/components/image_carousel/image_carousel.esm";
-import {useService} from "@web/core/utils/hooks";
+import {useBus, useService} from "@web/core/utils/hooks";
 
 export class PhotoGalleryModal extends Component {
     static template = "stock_barcodes_delivery_proof.PhotoGalleryModal";
     static components = {Dialog, CameraCapture, ImageCarousel};
     static props = {
         todoId: {type: Number, optional: true},
-        pickingId: {type: Number, optional: true},
+        pickingId: Number,
+        // Move lines of the todo (move_line mode)
+        moveLineIds: {type: Array, element: Number, optional: true},
         wizardId: Number,
         // Mode can be 'move_line' or 'picking'
         mode: {type: String, optional: true},
+        // Called after photos were deleted
+        onPhotosChanged: {type: Function, optional: true},
         close: Function,
     };
 
     setup() {
         this.orm = useService("orm");
         this.notification = useService("notification");
+        this.photoQueue = useService("delivery_proof_queue");
 
-        // Track if photos were added/deleted
         this.state = useState({
             photos: [],
             showCamera: false,
             loading: true,
-            photosChanged: false,
             mode: this.props.mode || "move_line",
+            // Captured photos not uploaded yet, and the ones among them
+            // refused by the server
+            pendingCount: 0,
+            failedCount: 0,
+            failedErrors: [],
             stats: {
                 total_count: 0,
                 lines_count: 0,
@@ -37,8 +45,18 @@ export class PhotoGalleryModal extends Component {
         });
 
         onWillStart(async () => {
-            await this.loadPhotos();
+            await Promise.all([this.loadPhotos(), this.loadPendingCount()]);
         });
+        useBus(this.photoQueue.bus, "queue-changed", () => this.loadPendingCount());
+        // Reconcile the photos and counts with the server
+        useBus(this.photoQueue.bus, "drained", () => this.loadPhotos());
+    }
+
+    async loadPendingCount() {
+        const counts = await this.photoQueue.getPhotoCounts(this.props.pickingId);
+        this.state.pendingCount = counts.pending;
+        this.state.failedCount = counts.failed;
+        this.state.failedErrors = counts.errors;
     }
 
     async loadPhotos() {
@@ -84,60 +102,36 @@ export class PhotoGalleryModal extends Component {
     }
 
     /**
-     * Close the modal and trigger a reload if photos were changed
+     * Close the modal. If photos were deleted, the client action refreshes
+     * the barcode wizard record.
      */
     closeModal() {
-        if (this.state.photosChanged) {
-            // Close with a flag to reload the parent view
-            this.props.close();
-            // Force a page reload to update the badge
-            window.location.reload();
-        } else {
-            // Just close normally
-            this.props.close();
-        }
+        this.props.close();
     }
 
-    async onPhotoCapture(imageData) {
+    async onPhotoCapture(blob) {
         try {
-            // In picking mode, we don't have a todo_id, so we need to handle it differently
-            // The wizard's action_save_delivery_photo_from_todo already handles both modes
-            // by checking the delivery_proof_level setting
-
-            let result = null;
-            if (this.state.mode === "picking") {
-                // For picking mode, we still call the same method but with a dummy todo_id
-                // The wizard will ignore it and save to picking level based on delivery_proof_level
-                result = await this.orm.call(
-                    "wiz.stock.barcodes.read.picking",
-                    "action_save_delivery_photo_from_todo",
-                    [this.props.wizardId, 0, imageData]
-                );
-            } else {
-                // Move line mode: pass the actual todo_id
-                result = await this.orm.call(
-                    "wiz.stock.barcodes.read.picking",
-                    "action_save_delivery_photo_from_todo",
-                    [this.props.wizardId, this.props.todoId, imageData]
-                );
-            }
-
-            if (result.success) {
-                this.notification.add(result.message, {type: "success"});
-
-                // Mark that photos were changed
-                this.state.photosChanged = true;
+            // Queue the photo and go on: it is uploaded in the background,
+            // and kept on the device until then.
+            // It is queued for the picking and the todo's move lines, which
+            // outlive this barcode wizard; the picking checks the
+            // delivery_proof_level setting: in picking mode the photo is
+            // saved to the picking.
+            await this.photoQueue.enqueue({
+                pickingId: this.props.pickingId,
+                moveLineIds:
+                    this.state.mode === "picking" ? [] : this.props.moveLineIds || [],
+                blob,
+            });
+            this.notification.add("Photo saved, it will be uploaded shortly", {
+                type: "success",
+            });
 
-                // Reload photos in the modal
-                await this.loadPhotos();
+            // The barcode form and this gallery are refreshed once the
+            // photo is uploaded
 
-                // Close camera view and return to gallery
-                this.state.showCamera = false;
-            } else {
-                this.notification.add(result.message || "Failed to save photo", {
-                    type: "danger",
-                });
-            }
+            // Close camera view and return to gallery
+            this.state.showCamera = false;
         } catch (error) {
             console.error("Error saving photo:", error);
             this.notification.add("Failed to save photo. Please try again.", {
@@ -157,8 +151,9 @@ export class PhotoGalleryModal extends Component {
             if (success) {
                 this.notification.add("Photo deleted successfully", {type: "success"});
 
-                // Mark that photos were changed
-                this.state.photosChanged = true;
+                if (this.props.onPhotosChanged) {
+                    this.props.onPhotosChanged();
+                }
 
                 // Reload photos in the modal
                 await this.loadPhotos();
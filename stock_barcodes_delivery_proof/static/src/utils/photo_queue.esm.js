@@ -0,0 +1,242 @@
+/** @odoo-module **/
+
+import {EventBus} from "@odoo/owl";
+import {RPCError} from "@web/core/network/rpc_service";
+import {browser} from "@web/core/browser/browser";
+import {registry} from "@web/core/registry";
+import {uploadDeliveryPhoto} from "@stock_barcodes_delivery_proof/utils/photo_upload.esm";
+
+const DB_NAME = "stock_barcodes_delivery_proof";
+const STORE_NAME = "photo_queue";
+// Delays between the attempts to sync a photo: doubled on each failure
+const MIN_RETRY_DELAY = 5 * 1000;
+const MAX_RETRY_DELAY = 5 * 60 * 1000;
+// Times a photo refused by the server is retried before it is left failed
+const MAX_REFUSALS = 5;
+
+function promisify(idbRequest) {
+    return new Promise((resolve, reject) => {
+        idbRequest.onsuccess = () => resolve(idbRequest.result);
+        idbRequest.onerror = () => reject(idbRequest.error);
+    });
+}
+
+function openDatabase() {
+    const idbRequest = window.indexedDB.open(DB_NAME, 1);
+    idbRequest.onupgradeneeded = () => {
+        idbRequest.result.createObjectStore(STORE_NAME, {keyPath: "key"});
+    };
+    return promisify(idbRequest);
+}
+
+/**
+ * Persistent queue of captured delivery proof photos.
+ *
+ * Photos are stored in IndexedDB as soon as they are captured, then
+ * uploaded in the background, oldest first. A photo that could not be
+ * uploaded is retried later, with a growing delay, and when the browser
+ * comes back online; photos left from a previous session are synced when
+ * the web client starts. Each photo has a key sent along with it, so the
+ * server does not save it twice when a sync is replayed.
+ *
+ * Photos are queued with their picking and move line IDs, which still
+ * exist when the queue is replayed in a later session (the barcode wizard
+ * records do not), and with the user and database they were taken in: the
+ * queue is shared by everyone using the browser, and only the photos of the
+ * current session are synced or counted. A photo refused by the server is
+ * retried with the longest delay, then kept on the device as failed after
+ * ``MAX_REFUSALS`` attempts; it is shown to the user, never dropped.
+ *
+ * Events triggered on ``bus``:
+ * - ``queue-changed``: photos were added to, synced from or failed in the
+ *   queue
+ * - ``drained``: photos were synced, and all the others are synced or
+ *   failed
+ */
+export const deliveryProofQueueService = {
+    dependencies: ["notification", "orm", "rpc", "user"],
+
+    start(env, {notification, orm, rpc, user}) {
+        const bus = new EventBus();
+        const dbPromise = openDatabase();
+        let draining = null;
+        let drainAgain = false;
+        let timeout = null;
+
+        async function store(mode, method, ...args) {
+            const db = await dbPromise;
+            const transaction = db.transaction(STORE_NAME, mode);
+            return promisify(transaction.objectStore(STORE_NAME)[method](...args));
+        }
+
+        async function getPhotos() {
+            const photos = await store("readonly", "getAll");
+            return photos
+                .filter((photo) => photo.uid === user.userId && photo.db === user.db)
+                .sort((a, b) => a.createdAt - b.createdAt);
+        }
+
+        async function syncPhoto(photo) {
+            const token = await uploadDeliveryPhoto(rpc, photo.blob);
+            return orm.call(
+                "stock.picking",
+                "action_attach_delivery_upload",
+                [photo.pickingId, token],
+                {move_line_ids: photo.moveLineIds, client_key: photo.key}
+            );
+        }
+
+        function scheduleRetry(photo, delay) {
+            photo.attempts++;
+            photo.nextAttempt = Date.now() + delay;
+            return store("readwrite", "put", photo);
+        }
+
+        function failPhoto(photo, message) {
+            // Retrying soon will not help (e.g. the picking is done or gone):
+            // keep the photo and tell the user, once per error and when it
+            // is no longer retried
+            photo.refusals = (photo.refusals || 0) + 1;
+            const stopped = photo.refusals >= MAX_REFUSALS;
+            if (photo.error !== message || stopped) {
+                notification.add(message, {
+                    title: stopped
+                        ? "Delivery proof photo not uploaded, no longer retried"
+                        : "Delivery proof photo not uploaded, kept on this device",
+                    type: "danger",
+                    sticky: true,
+                });
+            }
+            photo.error = message;
+            return scheduleRetry(photo, stopped ? Infinity : MAX_RETRY_DELAY);
+        }
+
+        async function drainQueue() {
+            browser.clearTimeout(timeout);
+            let nextAttempt = Infinity;
+            let changed = false;
+            let synced = false;
+            let waiting = false;
+            for (const photo of await getPhotos()) {
+                if (photo.nextAttempt > Date.now()) {
+                    nextAttempt = Math.min(nextAttempt, photo.nextAttempt);
+                    waiting = waiting || !photo.error;
+                    continue;
+                }
+                try {
+                    const result = await syncPhoto(photo);
+                    changed = true;
+                    if (result.success) {
+                        await store("readwrite", "delete", photo.key);
+                        synced = true;
+                        continue;
+                    }
+                    await failPhoto(photo, result.message);
+                } catch (error) {
+                    if (error instanceof RPCError) {
+                        changed = true;
+                        await failPhoto(photo, error.data?.message || error.message);
+                    } else {
+                        // Network error: retry soon
+                        waiting = true;
+                        await scheduleRetry(
+                            photo,
+                            Math.min(
+                                MIN_RETRY_DELAY * 2 ** photo.attempts,
+                                MAX_RETRY_DELAY
+                            )
+                        );
+                    }
+                }
+                nextAttempt = Math.min(nextAttempt, photo.nextAttempt);
+            }
+            if (nextAttempt < Infinity) {
+                timeout = browser.setTimeout(drain, nextAttempt - Date.now());
+            }
+            if (changed) {
+                bus.trigger("queue-changed");
+            }
+            if (synced && !waiting) {
+                bus.trigger("drained");
+            }
+        }
+
+        /**
+         * Sync the queued photos now. Photos queued while syncing are
+         * synced right after.
+         *
+         * @returns {Promise}
+         */
+        function drain() {
+            if (draining) {
+                drainAgain = true;
+                return draining;
+            }
+            draining = drainQueue()
+                .catch((error) => console.error("Delivery proof photo queue:", error))
+                .finally(() => {
+                    draining = null;
+                    if (drainAgain) {
+                        drainAgain = false;
+                        drain();
+                    }
+                });
+            return draining;
+        }
+
+        /**
+         * Queue a captured photo.
+         *
+         * @param {Object} params
+         * @param {Number} params.pickingId stock.picking ID
+         * @param {Number[]} params.moveLineIds stock.move.line IDs proven by
+         *     the photo, empty in picking mode
+         * @param {Blob} params.blob photo
+         * @returns {Promise<String>} key of the photo
+         */
+        async function enqueue({pickingId, moveLineIds, blob}) {
+            const photo = {
+                key: crypto.randomUUID(),
+                uid: user.userId,
+                db: user.db,
+                pickingId,
+                moveLineIds,
+                blob,
+                createdAt: Date.now(),
+                attempts: 0,
+                nextAttempt: 0,
+                refusals: 0,
+                error: null,
+            };
+            await store("readwrite", "put", photo);
+            bus.trigger("queue-changed");
+            drain();
+            return photo.key;
+        }
+
+        /**
+         * @param {Number} pickingId stock.picking ID
+         * @returns {Promise<Object>} ``{pending, failed}``: number of photos
+         *     of the picking waiting to be synced in this session, and among
+         *     them the ones refused by the server, with their ``errors``
+         */
+        async function getPhotoCounts(pickingId) {
+            const photos = (await getPhotos()).filter(
+                (photo) => photo.pickingId === pickingId
+            );
+            const errors = photos.filter((photo) => photo.error);
+            return {
+                pending: photos.length,
+                failed: errors.length,
+                errors: [...new Set(errors.map((photo) => photo.error))],
+            };
+        }
+
+        browser.addEventListener("online", drain);
+        drain();
+
+        return {bus, drain, enqueue, getPhotoCounts};
+    },
+};
+
+registry.category("services").add("delivery_proof_queue", deliveryProofQueueService);
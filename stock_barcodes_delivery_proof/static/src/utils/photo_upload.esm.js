@@ -0,0 +1,77 @@
+/** @odoo-module **/
+
+import {RPCError} from "@web/core/network/rpc_service";
+import {browser} from "@web/core/browser/browser";
+
+const UPLOAD_ROUTE = "/stock_barcodes_delivery_proof/upload";
+// Small enough for a chunk to go through a weak Wi-Fi link
+export const CHUNK_SIZE = 256 * 1024;
+export const MAX_ATTEMPTS = 5;
+
+async function sha1(blob) {
+    const digest = await crypto.subtle.digest("SHA-1", await blob.arrayBuffer());
+    return Array.from(new Uint8Array(digest), (byte) =>
+        byte.toString(16).padStart(2, "0")
+    ).join("");
+}
+
+function delay(ms) {
+    return new Promise((resolve) => browser.setTimeout(resolve, ms));
+}
+
+async function sendChunk(token, offset, chunk) {
+    const formData = new FormData();
+    formData.append("csrf_token", odoo.csrf_token);
+    formData.append("offset", offset);
+    formData.append("chunk", chunk);
+    const response = await browser.fetch(`${UPLOAD_ROUTE}/${token}`, {
+        method: "POST",
+        body: formData,
+    });
+    if (!response.ok) {
+        throw new Error(`Photo upload failed with status ${response.status}`);
+    }
+    return response.json();
+}
+
+/**
+ * Upload a photo as binary chunks.
+ *
+ * When the connection drops, the upload is resumed from the last chunk
+ * received by the server, waiting longer after each failed attempt.
+ *
+ * @param {Function} rpc rpc service
+ * @param {Blob} blob photo to upload
+ * @returns {Promise<String>} token of the completed upload, to attach with
+ *     stock.picking.action_attach_delivery_upload
+ */
+export async function uploadDeliveryPhoto(rpc, blob) {
+    const checksum = await sha1(blob);
+    for (let attempt = 1; ; attempt++) {
+        try {
+            // Starting again with the same photo resumes its upload
+            let {token, offset, done} = await rpc(UPLOAD_ROUTE, {
+                size: blob.size,
+                checksum,
+            });
+            while (!done) {
+                const status = await sendChunk(
+                    token,
+                    offset,
+                    blob.slice(offset, offset + CHUNK_SIZE)
+                );
+                if (!status.checksum_ok) {
+                    throw new Error("Photo upload corrupted, starting over");
+                }
+                ({offset, done} = status);
+            }
+            return token;
+        } catch (error) {
+            // Server side errors will not go away by retrying
+            if (error instanceof RPCError || attempt >= MAX_ATTEMPTS) {
+                throw error;
+            }
+            await delay(1000 * 2 ** (attempt - 1));
+        }
+    }
+}
@@ -0,0 +1,34 @@
+/** @odoo-module **/
+
+import {FormController} from "@web/views/form/form_controller";
+import {patch} from "@web/core/utils/patch";
+import {useBus, useService} from "@web/core/utils/hooks";
+
+const BARCODE_WIZARD_MODEL = "wiz.stock.barcodes.read.picking";
+
+/**
+ * Reload the barcode wizard record in place once the queued delivery proof
+ * photos are uploaded, so its photo counts are up to date whether the
+ * gallery modal is still open or not.
+ */
+patch(FormController.prototype, "stock_barcodes_delivery_proof.FormController", {
+    setup() {
+        this._super(...arguments);
+        if (this.props.resModel !== BARCODE_WIZARD_MODEL) {
+            return;
+        }
+        const photoQueue = useService("delivery_proof_queue");
+        useBus(photoQueue.bus, "drained", () => this.reloadDeliveryProofCounts());
+    },
+
+    async reloadDeliveryProofCounts() {
+        const record = this.model.root;
+        // Never discard what is being scanned: the counts are refreshed by
+        // the next reload
+        if (!record.resId || record.isDirty) {
+            return;
+        }
+        await record.load();
+        this.model.notify();
+    },
+});
@@ -2,3 +2,6 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
 from . import test_delivery_proof
+from . import test_delivery_proof_image
+from . import test_delivery_proof_photo_data
+from . import test_delivery_proof_upload
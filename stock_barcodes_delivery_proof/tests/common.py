@@ -0,0 +1,68 @@
+# Copyright 2025 Binhex - Antonio Ruban
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+import hashlib
+import os
+
+from odoo.tests import TransactionCase
+
+
+class DeliveryProofCommon(TransactionCase):
+    """Outgoing picking fixtures shared by the delivery proof photo tests."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+
+        cls.product = cls.env["product.product"].create(
+            {
+                "name": "Test Cake",
+                "type": "consu",
+            }
+        )
+
+        cls.warehouse = cls.env["stock.warehouse"].search(
+            [("company_id", "=", cls.env.company.id)], limit=1
+        )
+        cls.stock_location = cls.warehouse.lot_stock_id
+        cls.customer_location = cls.env.ref("stock.stock_location_customers")
+        cls.picking_type_out = cls.warehouse.out_type_id
+
+        # Sample image data (1x1 transparent PNG)
+        cls.sample_image = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="  # noqa E501
+
+    @classmethod
+    def _create_picking(cls, line_count=0):
+        """Create an outgoing picking with ``line_count`` done move lines."""
+        picking = cls.env["stock.picking"].create(
+            {
+                "picking_type_id": cls.picking_type_out.id,
+                "location_id": cls.stock_location.id,
+                "location_dest_id": cls.customer_location.id,
+            }
+        )
+        cls.env["stock.move.line"].create(
+            [
+                {
+                    "picking_id": picking.id,
+                    "product_id": cls.product.id,
+                    "product_uom_id": cls.product.uom_id.id,
+                    "location_id": cls.stock_location.id,
+                    "location_dest_id": cls.customer_location.id,
+                    "qty_done": 1.0,
+                }
+                for _i in range(line_count)
+            ]
+        )
+        return picking
+
+    def _start_upload(self, data, checksum=None):
+        """Start the upload of ``data``, its file being removed after the
+        test. Returns the upload and its status."""
+        Upload = self.env["stock.delivery.proof.upload"]
+        status = Upload._start(len(data), checksum or hashlib.sha1(data).hexdigest())
+        upload = Upload._get_by_token(status["token"])
+        path = upload._get_path()
+        self.addCleanup(lambda: os.path.exists(path) and os.unlink(path))
+        return upload, status
@@ -0,0 +1,148 @@
+# Copyright 2025 Binhex - Antonio Ruban
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+import base64
+import io
+
+from PIL import Image
+
+from odoo import Command
+from odoo.tests import tagged
+from odoo.tools.image import base64_to_image
+
+from .common import DeliveryProofCommon
+
+
+@tagged("post_install", "-at_install")
+class TestDeliveryProofImage(DeliveryProofCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.picking = cls._create_picking(line_count=3)
+        cls.move_lines = cls.picking.move_line_ids
+
+    def _create_shared_photo(self):
+        return self.env["stock.delivery.proof.image"].create(
+            {
+                "move_line_ids": [Command.set(self.move_lines.ids)],
+                "image": self.sample_image,
+            }
+        )
+
+    def test_01_shared_photo_counts(self):
+        """A photo proving several lines is stored once and counted per line."""
+        photo = self._create_shared_photo()
+        self.assertEqual(self.move_lines.delivery_proof_count, 1)
+        for line in self.move_lines:
+            self.assertEqual(line.delivery_proof_count, 1)
+            self.assertTrue(line.has_delivery_proof)
+            self.assertEqual(line.delivery_proof_image_ids, photo)
+        attachments = self.env["ir.attachment"].search(
+            [
+                ("res_model", "=", photo._name),
+                ("res_field", "=", "image"),
+                ("res_id", "=", photo.id),
+            ]
+        )
+        self.assertEqual(len(attachments), 1)
+
+    def test_02_search_move_line_id(self):
+        """The photo is found from any of the lines it proves."""
+        photo = self._create_shared_photo()
+        Image = self.env["stock.delivery.proof.image"]
+        for line in self.move_lines:
+            self.assertEqual(Image.search([("move_line_id", "=", line.id)]), photo)
+        self.assertEqual(photo.move_line_id, self.move_lines[0])
+
+    def test_03_move_line_id_inverse(self):
+        """Writing the single move line keeps working for per-line photos."""
+        photo = self.env["stock.delivery.proof.image"].create(
+            {"move_line_id": self.move_lines[1].id, "image": self.sample_image}
+        )
+        self.assertEqual(photo.move_line_ids, self.move_lines[1])
+        self.assertEqual(self.move_lines[1].delivery_proof_count, 1)
+        self.assertEqual(self.move_lines[0].delivery_proof_count, 0)
+
+    def test_04_unlink_move_lines(self):
+        """The photo is deleted with the last move line it proves."""
+        photo = self._create_shared_photo()
+        self.move_lines[:2].unlink()
+        self.assertTrue(photo.exists())
+        self.assertEqual(photo.move_line_ids, self.move_lines[2])
+        self.move_lines[2].unlink()
+        self.assertFalse(photo.exists())
+
+    def test_05_resized_variants(self):
+        """Resized copies are generated on save, the original is kept."""
+        output = io.BytesIO()
+        Image.new("RGB", (2000, 1500)).save(output, format="JPEG")
+        photo = self.env["stock.delivery.proof.image"].create(
+            {
+                "move_line_id": self.move_lines[0].id,
+                "image": base64.b64encode(output.getvalue()),
+            }
+        )
+        self.assertEqual(base64_to_image(photo.image).size, (2000, 1500))
+        self.assertEqual(base64_to_image(photo.image_1024).size, (1024, 768))
+        self.assertEqual(base64_to_image(photo.image_512).size, (512, 384))
+        self.assertEqual(base64_to_image(photo.image_128).size, (128, 96))
+
+    def test_06_gallery_data(self):
+        """The gallery gets metadata and cacheable URLs, no image payload."""
+        photo = self._create_shared_photo()
+        Image = self.env["stock.delivery.proof.image"]
+        data = Image.get_gallery_data(move_line_id=self.move_lines[2].id)
+        self.assertEqual([values["id"] for values in data], photo.ids)
+        values = data[0]
+        self.assertFalse(
+            {"image", "image_1024", "image_512", "image_128"} & set(values)
+        )
+        self.assertEqual(values["move_line_id"][0], self.move_lines[0].id)
+        for field in ("image_128", "image_512", "image_1024"):
+            self.assertIn(f"/{photo.id}/{field}?unique=", values["urls"][field])
+        self.assertIn("download=true", values["urls"]["download"])
+        self.assertEqual(Image.get_gallery_data(), [])
+
+    def test_07_webp_photo(self):
+        """A WebP photo keeps its format in its copies and is served as such."""
+        Photo = self.env["stock.delivery.proof.image"]
+        if "image/webp" not in Photo.get_supported_image_formats():
+            self.skipTest("Pillow was built without WebP support")
+        output = io.BytesIO()
+        Image.new("RGB", (1280, 960)).save(output, format="WEBP")
+        photo = Photo.create(
+            {
+                "move_line_id": self.move_lines[0].id,
+                "image": base64.b64encode(output.getvalue()),
+            }
+        )
+        self.assertEqual(photo.image_mimetype, "image/webp")
+        image_512 = base64_to_image(photo.image_512)
+        self.assertEqual(image_512.format, "WEBP")
+        self.assertEqual(image_512.size, (512, 384))
+        attachments = self.env["ir.attachment"].search(
+            [
+                ("res_model", "=", photo._name),
+                ("res_field", "!=", False),
+                ("res_id", "=", photo.id),
+            ]
+        )
+        self.assertEqual(len(attachments), 4)
+        self.assertEqual(set(attachments.mapped("mimetype")), {"image/webp"})
+
+    def test_08_rotated_photo(self):
+        """Copies are upright even when the photo is not resized."""
+        image = Image.new("RGB", (100, 50))
+        exif = image.getexif()
+        # Orientation 6: the photo is displayed rotated by 90 degrees.
+        exif[0x0112] = 6
+        output = io.BytesIO()
+        image.save(output, format="JPEG", exif=exif)
+        photo = self.env["stock.delivery.proof.image"].create(
+            {
+                "move_line_id": self.move_lines[0].id,
+                "image": base64.b64encode(output.getvalue()),
+            }
+        )
+        self.assertEqual(base64_to_image(photo.image_128).size, (50, 100))
+        self.assertEqual(base64_to_image(photo.image_1024).size, (50, 100))
@@ -0,0 +1,140 @@
+# Copyright 2025 Binhex - Antonio Ruban
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+import base64
+
+from odoo import Command, fields
+from odoo.tests import tagged
+
+from .common import DeliveryProofCommon
+
+
+@tagged("post_install", "-at_install")
+class TestDeliveryProofPhotoData(DeliveryProofCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env.company.write(
+            {"delivery_proof_enabled": True, "delivery_proof_level": "move_line"}
+        )
+
+    def _create_todo(self, line_count, photo_count):
+        """Create a picking wizard and a todo of ``line_count`` lines, each
+        proven by ``photo_count`` photos of its own and one shared photo."""
+        picking = self._create_picking(line_count)
+        lines = picking.move_line_ids
+        Image = self.env["stock.delivery.proof.image"]
+        Image.create(
+            [
+                {"move_line_ids": [Command.set(line.ids)], "image": self.sample_image}
+                for line in lines
+                for _i in range(photo_count)
+            ]
+            + [{"move_line_ids": [Command.set(lines.ids)], "image": self.sample_image}]
+        )
+        wizard = self.env["wiz.stock.barcodes.read.picking"].create(
+            {
+                "picking_id": picking.id,
+                "picking_type_code": "outgoing",
+                "option_group_id": self.env.ref(
+                    "stock_barcodes.stock_barcodes_option_group_out"
+                ).id,
+            }
+        )
+        todo = self.env["wiz.stock.barcodes.read.todo"].create(
+            {"wiz_barcode_id": wizard.id, "line_ids": [Command.set(lines.ids)]}
+        )
+        return wizard, todo
+
+    def test_01_todo_photo_data(self):
+        """Each photo is listed once, newest first, with its first line."""
+        wizard, todo = self._create_todo(line_count=2, photo_count=1)
+        photos = todo.line_ids.delivery_proof_image_ids.sorted("id")
+        for days, photo in enumerate(photos):
+            photo.capture_date = fields.Datetime.add(photo.capture_date, days=days)
+        shared = photos.filtered(lambda photo: len(photo.move_line_ids) == 2)
+
+        data = wizard.get_todo_photo_data(todo.id)
+        self.assertEqual(data["mode"], "move_line")
+        self.assertEqual(data["total_count"], 3)
+        self.assertEqual(data["lines_count"], 2)
+        self.assertEqual(data["lines_with_photos"], 2)
+        # The badge of the todo counts the photos of each line
+        self.assertEqual(data["delivery_proof_count"], 4)
+        self.assertEqual([photo["id"] for photo in data["photos"]], photos.ids[::-1])
+        shared_data = data["photos"][0]
+        self.assertEqual(shared_data["id"], shared.id)
+        self.assertEqual(shared_data["move_line_id"], todo.line_ids[0].id)
+        self.assertEqual(shared_data["product_name"], self.product.display_name)
+        self.assertEqual(shared_data["qty"], 1.0)
+        self.assertEqual(shared_data["uom"], self.product.uom_id.name)
+        self.assertNotIn("image", shared_data)
+
+    def test_02_todo_photo_data_queries(self):
+        """The number of queries does not depend on the lines or photos."""
+        counts = []
+        for line_count, photo_count in ((1, 1), (10, 5)):
+            wizard, todo = self._create_todo(line_count, photo_count)
+            self.env.invalidate_all()
+            start = self.env.cr.sql_log_count
+            data = wizard.get_todo_photo_data(todo.id)
+            counts.append(self.env.cr.sql_log_count - start)
+            self.assertEqual(data["total_count"], line_count * photo_count + 1)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_03_picking_photo_data(self):
+        """Picking mode returns the picking photos, newest first."""
+        self.env.company.delivery_proof_level = "picking"
+        wizard, todo = self._create_todo(line_count=1, photo_count=1)
+        photos = self.env["stock.delivery.proof.image"].create(
+            [
+                {"picking_id": wizard.picking_id.id, "image": self.sample_image}
+                for _i in range(2)
+            ]
+        )
+        data = wizard.get_todo_photo_data(todo.id)
+        self.assertEqual(data, wizard.get_picking_photo_data())
+        self.assertEqual(data["mode"], "picking")
+        self.assertEqual(data["picking_proof_count"], 2)
+        self.assertEqual(sorted(p["id"] for p in data["photos"]), photos.ids)
+        self.assertEqual(data["photos"][0]["picking_name"], wizard.picking_id.name)
+
+    def test_04_replayed_photo(self):
+        """A photo saved again with the same client key is not duplicated."""
+        wizard, todo = self._create_todo(line_count=2, photo_count=0)
+        result = wizard.action_save_delivery_photo_from_todo(
+            todo.id, self.sample_image, client_key="photo-1"
+        )
+        self.assertTrue(result["success"])
+        self.assertEqual(result["move_line_count"], 2)
+        replayed = wizard.action_save_delivery_photo_from_todo(
+            todo.id, self.sample_image, client_key="photo-1"
+        )
+        self.assertEqual(replayed, result)
+        # The upload of the saved photo is gone, the key is enough
+        replayed = wizard.picking_id.action_attach_delivery_upload(
+            "unknown-token", todo.line_ids.ids, client_key="photo-1"
+        )
+        self.assertEqual(replayed, result)
+        self.assertEqual(todo.line_ids[0].delivery_proof_count, 2)
+
+    def test_05_attach_upload_to_picking(self):
+        """Queued photos are attached through the picking, the barcode
+        wizard that captured them being gone."""
+        wizard, todo = self._create_todo(line_count=2, photo_count=0)
+        picking, lines = wizard.picking_id, todo.line_ids
+        wizard.unlink()
+        data = base64.b64decode(self.sample_image)
+        upload, status = self._start_upload(data)
+        token = status["token"]
+        upload._write_chunk(0, data)
+        # Move lines of other pickings are never attached
+        result = picking.action_attach_delivery_upload(token, [0], client_key="p-2")
+        self.assertFalse(result["success"])
+        self.assertTrue(upload.exists())
+        result = picking.action_attach_delivery_upload(
+            token, lines.ids, client_key="p-2"
+        )
+        self.assertTrue(result["success"])
+        self.assertEqual(result["move_line_count"], 2)
+        self.assertFalse(upload.exists())
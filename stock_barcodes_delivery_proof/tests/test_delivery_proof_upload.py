@@ -0,0 +1,61 @@
+# Copyright 2025 Binhex - Antonio Ruban
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+
+import hashlib
+import os
+
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+
+from .common import DeliveryProofCommon
+
+
+@tagged("post_install", "-at_install")
+class TestDeliveryProofUpload(DeliveryProofCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Upload = cls.env["stock.delivery.proof.upload"]
+        cls.data = os.urandom(1000)
+        cls.checksum = hashlib.sha1(cls.data).hexdigest()
+
+    def _start(self, data=None, checksum=None):
+        return self._start_upload(data or self.data, checksum or self.checksum)
+
+    def test_01_upload_in_chunks(self):
+        upload, status = self._start()
+        self.assertEqual(status["offset"], 0)
+        self.assertFalse(status["done"])
+        status = upload._write_chunk(0, self.data[:400])
+        self.assertEqual(status["offset"], 400)
+        status = upload._write_chunk(400, self.data[400:])
+        self.assertTrue(status["done"])
+        self.assertTrue(status["checksum_ok"])
+        self.assertEqual(upload._read(), self.data)
+
+    def test_02_resume(self):
+        """Starting the same photo again resumes it, resent chunks are
+        rewritten and chunks past the received size are ignored."""
+        upload, status = self._start()
+        upload._write_chunk(0, self.data[:400])
+        upload2, status = self._start()
+        self.assertEqual(upload2, upload)
+        self.assertEqual(status["offset"], 400)
+        self.assertEqual(upload._write_chunk(800, self.data[800:])["offset"], 400)
+        self.assertEqual(upload._write_chunk(200, self.data[200:600])["offset"], 600)
+        self.assertTrue(upload._write_chunk(600, self.data[600:])["done"])
+        self.assertEqual(upload._read(), self.data)
+
+    def test_03_checksum_mismatch(self):
+        upload, status = self._start(checksum=hashlib.sha1(b"other").hexdigest())
+        status = upload._write_chunk(0, self.data)
+        self.assertFalse(status["checksum_ok"])
+        self.assertFalse(status["done"])
+        self.assertEqual(status["offset"], 0)
+
+    def test_04_limits(self):
+        upload, status = self._start()
+        with self.assertRaises(UserError):
+            upload._write_chunk(0, self.data + b"extra")
+        with self.assertRaises(UserError):
+            self.Upload._start(self.Upload.MAX_SIZE + 1, self.checksum)
@@ -1,7 +1,7 @@
 # Copyright 2025 Binhex - Antonio Ruban
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
-from odoo import api, fields, models
+from odoo import Command, api, fields, models
 
 
 class WizStockBarcodesReadPicking(models.TransientModel):
@@ -40,7 +40,7 @@ class WizStockBarcodesReadPicking(models.TransientModel):
 
         photo = self.env["stock.delivery.proof.image"].create(
             {
-                "move_line_id": move_line_id,
+                "move_line_ids": [Command.set([move_line_id])],
                 "image": image_data,
             }
         )
@@ -51,46 +51,38 @@ class WizStockBarcodesReadPicking(models.TransientModel):
                 photo.capture_date.isoformat() if photo.capture_date else None
             ),
             "captured_by": photo.captured_by_id.name if photo.captured_by_id else None,
+            "urls": photo._get_image_urls(),
         }
 
-    def action_save_delivery_photo_from_todo(self, todo_id, image_data):
+    def action_save_delivery_photo_from_todo(
+        self, todo_id, image_data, client_key=None
+    ):
         """Save photo based on company delivery_proof_level setting.
 
-        - If 'move_line': Creates duplicate photo records for each move line in todo
+        - If 'move_line': Creates one photo record shared by all move lines in todo
         - If 'picking': Creates single photo record at picking level
 
         Args:
             todo_id (int): ID of wiz.stock.barcodes.read.todo (optional for picking)
             image_data (str): Base64 encoded image data
+            client_key (str): Key of the photo on the client. A photo already
+                saved with this key is returned instead of being saved again.
 
         Returns:
             dict: {
                 'success': bool,
-                'photo_ids': list of created photo IDs,
+                'photo_ids': list with the created photo ID,
                 'move_line_count': number of lines affected (0 for picking mode),
                 'message': success/error message
             }
         """
         self.ensure_one()
+        picking = self.picking_id
 
         # Check delivery proof level from company settings
-        proof_level = self.picking_id.company_id.delivery_proof_level
-
-        if proof_level == "picking":
+        if picking.company_id.delivery_proof_level == "picking":
             # Save to picking level - NO todo_id required
-            photo = self.env["stock.delivery.proof.image"].create(
-                {
-                    "picking_id": self.picking_id.id,
-                    "image": image_data,
-                }
-            )
-            return {
-                "success": True,
-                "photo_ids": [photo.id],
-                "move_line_count": 0,
-                "message": "Photo saved to picking",
-                "mode": "picking",
-            }
+            return picking._save_delivery_photo(image_data, client_key=client_key)
 
         # For move_line mode, we MUST have a valid todo
         todo = self.env["wiz.stock.barcodes.read.todo"].browse(todo_id)
@@ -110,25 +102,33 @@ class WizStockBarcodesReadPicking(models.TransientModel):
                 "photo_ids": [],
                 "move_line_count": 0,
             }
+        return picking._save_delivery_photo(
+            image_data, todo.line_ids.ids, client_key=client_key
+        )
 
-        # Create photo for each move line
-        photo_ids = []
-        for move_line in todo.line_ids:
-            photo = self.env["stock.delivery.proof.image"].create(
-                {
-                    "move_line_id": move_line.id,
-                    "image": image_data,
-                }
-            )
-            photo_ids.append(photo.id)
+    def _read_delivery_photos(self, domain, fields=None):
+        """Read the photos matching ``domain``, newest first.
 
-        return {
-            "success": True,
-            "photo_ids": photo_ids,
-            "move_line_count": len(photo_ids),
-            "message": f"Photo saved to {len(photo_ids)} move line(s)",
-            "mode": "move_line",
-        }
+        The photos are read at once, sorted by the database and without
+        their image, whatever their number.
+
+        Args:
+            domain (list): domain on stock.delivery.proof.image
+            fields (list): fields to read besides the metadata
+
+        Returns:
+            list: ``search_read`` values, each with its ``urls``
+        """
+        Image = self.env["stock.delivery.proof.image"]
+        photos = Image.search_read(
+            domain,
+            ["capture_date", "captured_by_id", "write_date"] + (fields or []),
+            order="capture_date desc, id desc",
+        )
+        for values in photos:
+            # write_date is already cached by search_read
+            values["urls"] = Image.browse(values["id"])._get_image_urls()
+        return photos
 
     def get_todo_photo_data(self, todo_id):
         """Get all photos based on delivery_proof_level setting.
@@ -144,7 +144,9 @@ class WizStockBarcodesReadPicking(models.TransientModel):
                 'photos': list of photo dicts with metadata,
                 'total_count': total number of photos,
                 'lines_count': number of move lines (0 for picking mode),
-                'lines_with_photos': number of lines that have photos (0 for picking)
+                'lines_with_photos': number of lines that have photos (0 for picking),
+                'delivery_proof_count': new photo count of the todo (move_line mode),
+                'picking_proof_count': new photo count of the picking
             }
         """
         self.ensure_one()
@@ -163,75 +165,62 @@ class WizStockBarcodesReadPicking(models.TransientModel):
 
         if proof_level == "picking":
             # Get picking-level photos
-            all_photos = []
-            for photo in self.picking_id.picking_proof_image_ids:
-                all_photos.append(
-                    {
-                        "id": photo.id,
-                        "capture_date": (
-                            photo.capture_date.isoformat()
-                            if photo.capture_date
-                            else None
-                        ),
-                        "captured_by": (
-                            photo.captured_by_id.name if photo.captured_by_id else None
-                        ),
-                        "picking_id": self.picking_id.id,
-                        "picking_name": self.picking_id.name,
-                        "model": "stock.delivery.proof.image",
-                    }
-                )
-
-            # Sort by capture_date (newest first)
-            all_photos.sort(key=lambda x: x["capture_date"] or "", reverse=True)
-
-            return {
-                "photos": all_photos,
-                "total_count": len(all_photos),
-                "lines_count": 0,
-                "lines_with_photos": 0,
-                "mode": "picking",
-            }
+            return self.get_picking_photo_data()
 
         # Default: move_line level
-        # Collect all photos from all move lines
+        # Read the lines and their photos set-wise, listing a photo shared by
+        # several lines once (with its first line in the todo)
+        lines = todo.line_ids
+        line_position = {line_id: index for index, line_id in enumerate(lines.ids)}
+        lines_data = {
+            values["id"]: values
+            for values in lines.read(
+                ["product_id", "lot_id", "qty_done", "product_uom_id"]
+            )
+        }
+        photos = self._read_delivery_photos(
+            [("move_line_ids", "in", lines.ids)], ["move_line_ids"]
+        )
+
         all_photos = []
-        lines_with_photos = 0
-
-        for move_line in todo.line_ids:
-            if move_line.delivery_proof_image_ids:
-                lines_with_photos += 1
-
-            for photo in move_line.delivery_proof_image_ids:
-                all_photos.append(
-                    {
-                        "id": photo.id,
-                        "capture_date": (
-                            photo.capture_date.isoformat()
-                            if photo.capture_date
-                            else None
-                        ),
-                        "captured_by": (
-                            photo.captured_by_id.name if photo.captured_by_id else None
-                        ),
-                        "move_line_id": move_line.id,
-                        "product_name": move_line.product_id.display_name,
-                        "lot_name": move_line.lot_id.name if move_line.lot_id else None,
-                        "qty": move_line.qty_done,
-                        "uom": move_line.product_uom_id.name,
-                        "model": "stock.delivery.proof.image",
-                    }
-                )
-
-        # Sort by capture date (newest first)
-        all_photos.sort(key=lambda x: x.get("capture_date") or "", reverse=True)
+        lines_with_photos = set()
+        for photo in photos:
+            photo_line_ids = [
+                line_id
+                for line_id in photo["move_line_ids"]
+                if line_id in line_position
+            ]
+            lines_with_photos.update(photo_line_ids)
+            move_line = lines_data[min(photo_line_ids, key=line_position.get)]
+            all_photos.append(
+                {
+                    "id": photo["id"],
+                    "capture_date": (
+                        photo["capture_date"].isoformat()
+                        if photo["capture_date"]
+                        else None
+                    ),
+                    "captured_by": (
+                        photo["captured_by_id"][1] if photo["captured_by_id"] else None
+                    ),
+                    "move_line_id": move_line["id"],
+                    "product_name": move_line["product_id"][1],
+                    "lot_name": move_line["lot_id"][1] if move_line["lot_id"] else None,
+                    "qty": move_line["qty_done"],
+                    "uom": move_line["product_uom_id"][1],
+                    "model": "stock.delivery.proof.image",
+                    "urls": photo["urls"],
+                }
+            )
 
         return {
             "photos": all_photos,
             "total_count": len(all_photos),
-            "lines_count": len(todo.line_ids),
-            "lines_with_photos": lines_with_photos,
+            "lines_count": len(lines),
+            "lines_with_photos": len(lines_with_photos),
             "mode": "move_line",
+            "delivery_proof_count": todo.delivery_proof_count,
+            "picking_proof_count": self.picking_proof_count,
         }
 
     def get_picking_photo_data(self):
@@ -243,30 +232,28 @@ class WizStockBarcodesReadPicking(models.TransientModel):
                 'total_count': total number of photos,
                 'lines_count': 0 (not applicable for picking mode),
                 'lines_with_photos': 0 (not applicable for picking mode),
-                'mode': 'picking'
+                'mode': 'picking',
+                'picking_proof_count': new photo count of the picking
             }
         """
         self.ensure_one()
-        all_photos = []
-
-        for photo in self.picking_id.picking_proof_image_ids:
-            all_photos.append(
-                {
-                    "id": photo.id,
-                    "capture_date": (
-                        photo.capture_date.isoformat() if photo.capture_date else None
-                    ),
-                    "captured_by": (
-                        photo.captured_by_id.name if photo.captured_by_id else None
-                    ),
-                    "picking_id": self.picking_id.id,
-                    "picking_name": self.picking_id.name,
-                    "model": "stock.delivery.proof.image",
-                }
-            )
-
-        # Sort by capture_date (newest first)
-        all_photos.sort(key=lambda x: x["capture_date"] or "", reverse=True)
+        photos = self._read_delivery_photos([("picking_id", "=", self.picking_id.id)])
+        all_photos = [
+            {
+                "id": photo["id"],
+                "capture_date": (
+                    photo["capture_date"].isoformat() if photo["capture_date"] else None
+                ),
+                "captured_by": (
+                    photo["captured_by_id"][1] if photo["captured_by_id"] else None
+                ),
+                "picking_id": self.picking_id.id,
+                "picking_name": self.picking_id.name,
+                "model": "stock.delivery.proof.image",
+                "urls": photo["urls"],
+            }
+            for photo in photos
+        ]
 
         return {
             "photos": all_photos,
@@ -274,6 +261,7 @@ class WizStockBarcodesReadPicking(models.TransientModel):
             "lines_count": 0,
             "lines_with_photos": 0,
             "mode": "picking",
+            "picking_proof_count": len(all_photos),
         }
 
     def action_delete_delivery_photo(self, photo_id):
@@ -318,6 +306,7 @@ class WizStockBarcodesReadPicking(models.TransientModel):
                     "captured_by": (
                         photo.captured_by_id.name if photo.captured_by_id else None
                     ),
+                    "urls": photo._get_image_urls(),
                 }
                 for photo in move_line.delivery_proof_image_ids
             ],
@@ -352,11 +341,16 @@ class WizStockBarcodesReadPicking(models.TransientModel):
             return {"type": "ir.actions.act_window_close"}
 
         # Return a client action to trigger JS
+        # The photos are queued for the picking and move lines, which outlive
+        # this wizard and its todos
+        todo = self.env["wiz.stock.barcodes.read.todo"].browse(todo_id)
         return {
             "type": "ir.actions.client",
             "tag": "display_delivery_proof_modal",
             "params": {
                 "todo_id": todo_id,
+                "picking_id": self.picking_id.id,
+                "move_line_ids": todo.line_ids.ids,
                 "wizard_id": self.id,
                 "mode": "move_line",
             },